@@ -14,14 +14,90 @@ Usage:
 """
 
 import argparse
-import glob
+import functools
 import json
+import mmap
 import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 # Configuration
 PHOTOS_DIR = "assets/real-estate"
 PHOTOS_CONFIG = "config/photos.json"
 JS_FILE = "src/js/real-estate.js"
+SCAN_STAMP = "config/.photos-scan.json"
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+# Caption cleanup: strip the image extension, then turn separators into spaces
+_EXT_RE = re.compile(r"\.(jpe?g|png|webp)$", re.IGNORECASE)
+_SEP_TABLE = str.maketrans("-_", "  ")
+
+# Optional markers around portfolioData in JS_FILE; when present the block is
+# swapped directly instead of brace counting
+_BEGIN_MARKER = b"// BEGIN portfolioData\n"
+_END_MARKER = b"// END portfolioData"
+
+
+def is_image_name(name):
+    """Check a filename's extension against IMAGE_EXTENSIONS, ignoring case"""
+    # Lower-case names (the usual case) match without allocating a copy
+    return name.endswith(IMAGE_EXTENSIONS) or name.lower().endswith(IMAGE_EXTENSIONS)
+
+
+@functools.lru_cache(maxsize=8192)
+def image_caption(img_name):
+    """Turn an image filename into a caption (front-yard.jpg -> Front Yard)"""
+    return _EXT_RE.sub("", img_name).translate(_SEP_TABLE).title()
+
+
+def scan_shoot_images(shoot_path):
+    """Return the sorted image filenames in one shoot directory"""
+    images = []
+    with os.scandir(shoot_path) as entries:
+        for entry in entries:
+            name = entry.name
+            if name[0] != "." and entry.is_file() and is_image_name(name):
+                images.append(name)
+    return sorted(images)
+
+
+def list_shoot_dirs(with_stat=False):
+    """Return the shoot directory entries in PHOTOS_DIR, sorted by name
+
+    Symlinked shoots are followed, but each directory is listed only once
+    (keyed by device and inode) so aliases or link loops can't duplicate it.
+    """
+    with os.scandir(PHOTOS_DIR) as entries:
+        candidates = sorted(
+            (entry for entry in entries if entry.name[0] != "." and entry.is_dir()),
+            key=lambda entry: entry.name,
+        )
+
+    shoot_dirs = []
+    visited = set()
+    for entry in candidates:
+        try:
+            entry_stat = entry.stat()
+        except OSError:
+            continue
+        key = (entry_stat.st_dev, entry_stat.st_ino)
+        if key not in visited:
+            visited.add(key)
+            shoot_dirs.append((entry, entry_stat) if with_stat else entry)
+    return shoot_dirs
+
+
+def build_shoot_images(shoot_name, img_names):
+    """Build the url/caption entries for one shoot's images"""
+    return [
+        {
+            # Web paths always use "/", whatever the local separator
+            "url": f"{PHOTOS_DIR}/{shoot_name}/{img_name}",
+            "caption": image_caption(img_name),
+        }
+        for img_name in img_names
+    ]
 
 
 def scan_photos_directory():
@@ -33,59 +109,97 @@ def scan_photos_directory():
         os.makedirs(PHOTOS_DIR, exist_ok=True)
         return photo_data
 
-    # Scan for shoot directories
-    for shoot_dir in glob.glob(f"{PHOTOS_DIR}/*/"):
-        shoot_name = os.path.basename(shoot_dir.rstrip("/"))
+    shoot_dirs = list_shoot_dirs()
+    shoot_names = [shoot_entry.name for shoot_entry in shoot_dirs]
 
-        # Skip hidden directories
-        if shoot_name.startswith("."):
-            continue
+    # Enumerate shoots concurrently; directory reads are IO-bound and release
+    # the GIL, so this overlaps latency on slow or network filesystems
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        scanned = list(
+            executor.map(
+                scan_shoot_images, [shoot_entry.path for shoot_entry in shoot_dirs]
+            )
+        )
 
+    # Captions are a few string operations each; this stays serial because
+    # pickling for a process pool costs more than the work even at 50k images
+    built = list(map(build_shoot_images, shoot_names, scanned))
+
+    for shoot_name, shoot_images in zip(shoot_names, built):
         print(f"Found shoot directory: {shoot_name}")
 
-        # Find images in the shoot directory
-        image_extensions = ["*.jpg", "*.jpeg", "*.png", "*.webp"]
-        images = []
-
-        for ext in image_extensions:
-            images.extend(glob.glob(f"{shoot_dir}/{ext}"))
-            images.extend(glob.glob(f"{shoot_dir}/{ext.upper()}"))
-
-        if images:
-            shoot_title = shoot_name.replace("-", " ").replace("_", " ")
-            photo_data[shoot_name] = {
-                "title": shoot_title.title(),
-                "description": f"Professional aerial photography of {shoot_title}",
-                "category": "residential",  # Default category
-                "images": [],
-            }
-
-            for img_path in sorted(images):
-                img_name = os.path.basename(img_path)
-                web_path = img_path.replace("\\", "/")  # Normalize path separators
-
-                photo_data[shoot_name]["images"].append(
-                    {
-                        "url": web_path,
-                        "caption": img_name.replace(".jpg", "")
-                        .replace(".jpeg", "")
-                        .replace(".png", "")
-                        .replace("-", " ")
-                        .replace("_", " ")
-                        .title(),
-                    }
-                )
-
-            print(f"  Found {len(images)} images")
+        if not shoot_images:
+            continue
+
+        shoot_title = shoot_name.replace("-", " ").replace("_", " ")
+        photo_data[shoot_name] = {
+            "title": shoot_title.title(),
+            "description": f"Professional aerial photography of {shoot_title}",
+            "category": "residential",  # Default category
+            "images": shoot_images,
+        }
+
+        print(f"  Found {len(shoot_images)} images")
 
     return photo_data
 
 
+def photos_tree_mtime():
+    """Return the newest directory mtime (ns) in the photos tree, or None
+
+    Only file names end up in the generated data, and adding, removing or
+    renaming a file bumps its directory's mtime, so shoot directories are
+    stat'ed through their cached DirEntry data and files are not stat'ed.
+    """
+    try:
+        newest = os.stat(PHOTOS_DIR).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    for shoot_entry, shoot_stat in list_shoot_dirs(with_stat=True):
+        newest = max(newest, shoot_stat.st_mtime_ns)
+    return newest
+
+
+def file_mtime_ns(path):
+    """Return path's mtime in ns, or None if it doesn't exist"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def scan_stamp(tree_mtime):
+    """Everything a run's output depends on: the photos tree, plus the config
+    and JS files, so hand edits to either are picked up too"""
+    return {
+        "mtime_ns": tree_mtime,
+        "config_mtime_ns": file_mtime_ns(PHOTOS_CONFIG),
+        "js_mtime_ns": file_mtime_ns(JS_FILE),
+    }
+
+
+def load_scan_stamp():
+    """Load the stamp recorded by the last successful update"""
+    try:
+        with open(SCAN_STAMP, "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def save_scan_stamp(stamp):
+    """Record the stamp so unchanged runs can be skipped"""
+    with open(SCAN_STAMP, "w") as f:
+        json.dump(stamp, f)
+
+
 def load_existing_config():
     """Load existing photo configuration if it exists"""
     if os.path.exists(PHOTOS_CONFIG):
         try:
-            with open(PHOTOS_CONFIG, "r") as f:
+            with open(PHOTOS_CONFIG, "r", encoding="utf-8") as f:
                 return json.load(f)
         except json.JSONDecodeError:
             print(f"Warning: {PHOTOS_CONFIG} contains invalid JSON, starting fresh")
@@ -94,55 +208,194 @@ def load_existing_config():
 
 
 def save_config(photo_data):
-    """Save photo configuration to JSON file"""
-    with open(PHOTOS_CONFIG, "w") as f:
-        json.dump(photo_data, f, indent=2)
+    """Save photo configuration to JSON file (skipped if nothing changed)"""
+    data = json.dumps(photo_data, indent=2, ensure_ascii=False).encode()
+    try:
+        with open(PHOTOS_CONFIG, "rb") as f:
+            unchanged = f.read() == data
+    except FileNotFoundError:
+        unchanged = False
+
+    if unchanged:
+        print(f"Configuration unchanged, not rewriting {PHOTOS_CONFIG}")
+        return
+
+    write_file_atomic(PHOTOS_CONFIG, data)
     print(f"Saved configuration to {PHOTOS_CONFIG}")
 
 
-def update_javascript_file(photo_data):
-    """Update the JavaScript file with new photo data"""
+def write_file_atomic(path, data):
+    """Write bytes to path via a temp file so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp creates 0600 files; keep the existing mode or the umask default
+        if os.path.exists(path):
+            mode = os.stat(path).st_mode & 0o777
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def shoot_js_block(shoot_id, shoot_data):
+    """Render one shoot as a marked, line-addressable portfolioData entry"""
+    key = json.dumps(shoot_id, ensure_ascii=False)
+    value = json.dumps(shoot_data, separators=(",", ":"), ensure_ascii=False)
+    return f"// SHOOT:{shoot_id}\n{key}:{value},\n// /SHOOT:{shoot_id}".encode()
+
+
+def find_marked_span(buf, begin, end):
+    """Return (start, stop) of the first begin...end span in buf, or None"""
+    start = buf.find(begin)
+    if start == -1:
+        return None
+    stop = buf.find(end, start + len(begin))
+    if stop == -1:
+        return None
+    return start, stop + len(end)
+
+
+def find_matching_brace(buf, open_idx):
+    """Return the index just past the brace closing buf[open_idx], or -1
+
+    Jumps between braces with find() so the scan runs in C rather than
+    visiting every byte in Python.
+    """
+    depth = 0
+    pos = open_idx
+    while True:
+        next_open = buf.find(b"{", pos)
+        next_close = buf.find(b"}", pos)
+        if next_close == -1:
+            return -1
+        if next_open != -1 and next_open < next_close:
+            depth += 1
+            pos = next_open + 1
+        else:
+            depth -= 1
+            pos = next_close + 1
+            if depth == 0:
+                return pos
+
+
+def stale_shoot_blocks(buf, photo_data):
+    """Return the shoots whose block in buf doesn't match photo_data
+
+    Returns None if the file's blocks don't line up with photo_data (a shoot
+    is missing, or the file has extra or unmarked ones), so the caller can
+    regenerate the whole object instead.
+    """
+    marked = 0
+    pos = buf.find(b"// SHOOT:")
+    while pos != -1:
+        marked += 1
+        pos = buf.find(b"// SHOOT:", pos + 1)
+    if marked != len(photo_data):
+        return None
+
+    stale = []
+    for shoot_id, shoot_data in photo_data.items():
+        block = shoot_js_block(shoot_id, shoot_data)
+        start = buf.find(block[: block.index(b"\n") + 1])
+        if start == -1:
+            return None
+        if buf[start : start + len(block) + 1] != block + b"\n":
+            stale.append(shoot_id)
+    return stale
+
+
+def splice_shoot_blocks(buf, photo_data, shoot_ids):
+    """Replace only the given shoots' blocks; return None if any block is missing"""
+    spans = []
+    for shoot_id in shoot_ids:
+        span = find_marked_span(
+            buf, f"// SHOOT:{shoot_id}\n".encode(), f"// /SHOOT:{shoot_id}\n".encode()
+        )
+        if span is None:
+            return None
+        # Keep the trailing newline that terminated the end marker
+        spans.append(
+            (span[0], span[1] - 1, shoot_js_block(shoot_id, photo_data[shoot_id]))
+        )
+
+    pieces = []
+    pos = 0
+    for start, stop, block in sorted(spans):
+        pieces += [buf[pos:start], block]
+        pos = stop
+    pieces.append(buf[pos:])
+    return b"".join(pieces)
+
+
+def render_portfolio_data(buf, photo_data):
+    """Replace the whole portfolioData object in buf; return None if not found"""
+    # Generate new JavaScript object, one marked block per shoot
+    shoot_blocks = b"\n".join(
+        shoot_js_block(shoot_id, shoot_data)
+        for shoot_id, shoot_data in photo_data.items()
+    )
+    js_object = b"const portfolioData = {\n" + shoot_blocks + b"\n};"
+
+    # Fast path: replace everything between the BEGIN/END markers
+    span = find_marked_span(buf, _BEGIN_MARKER, _END_MARKER)
+    if span is not None:
+        start_idx, end_idx = span
+        js_object = _BEGIN_MARKER + js_object + b"\n" + _END_MARKER
+    else:
+        # Find the portfolioData object and replace it
+        start_marker = b"const portfolioData = {"
+
+        start_idx = buf.find(start_marker)
+        if start_idx == -1:
+            return None
+
+        # Find the end of the portfolioData object
+        end_idx = find_matching_brace(buf, start_idx + len(start_marker) - 1)
+        if end_idx == -1:
+            return None
+
+    # Replace the old object with the new one
+    return buf[:start_idx] + js_object + buf[end_idx:]
+
+
+def update_javascript_file(photo_data, full=False):
+    """Update the JavaScript file with new photo data
+
+    Unless full is set, the shoot blocks already in the file are compared
+    with photo_data and only the differing ones are rewritten; if the blocks
+    don't line up, the whole object is regenerated. The file is memory-mapped
+    so only the edited region is ever re-encoded.
+    """
     if not os.path.exists(JS_FILE):
         print(f"Warning: {JS_FILE} not found, skipping JavaScript update")
         return
 
-    # Read the current JavaScript file
-    with open(JS_FILE, "r") as f:
-        js_content = f.read()
-
-    # Find the portfolioData object and replace it
-    start_marker = "const portfolioData = {"
-
-    start_idx = js_content.find(start_marker)
-    if start_idx == -1:
+    new_js_content = None
+    with open(JS_FILE, "rb") as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                stale = None if full else stale_shoot_blocks(buf, photo_data)
+                if stale == []:
+                    print(f"No shoot changes, leaving {JS_FILE} untouched")
+                    return
+                if stale is not None:
+                    new_js_content = splice_shoot_blocks(buf, photo_data, stale)
+                if new_js_content is None:
+                    new_js_content = render_portfolio_data(buf, photo_data)
+
+    if new_js_content is None:
         print(f"Warning: Could not find portfolioData in {JS_FILE}")
         return
 
-    # Find the end of the portfolioData object
-    brace_count = 0
-    end_idx = start_idx + len(start_marker) - 1  # Start from the opening brace
-
-    for i, char in enumerate(
-        js_content[start_idx + len(start_marker) - 1 :],
-        start_idx + len(start_marker) - 1,
-    ):
-        if char == "{":
-            brace_count += 1
-        elif char == "}":
-            brace_count -= 1
-            if brace_count == 0:
-                end_idx = i + 1
-                break
-
-    # Generate new JavaScript object
-    js_object = "const portfolioData = " + json.dumps(photo_data, indent=2) + ";"
-
-    # Replace the old object with the new one
-    new_js_content = js_content[:start_idx] + js_object + js_content[end_idx:]
-
     # Write the updated file
-    with open(JS_FILE, "w") as f:
-        f.write(new_js_content)
+    write_file_atomic(JS_FILE, new_js_content)
 
     print(f"Updated {JS_FILE} with new photo data")
 
@@ -181,6 +434,11 @@ def main():
         action="store_true",
         help="Only scan directories, don't update files",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rescan and rewrite files even if no photos changed",
+    )
 
     args = parser.parse_args()
 
@@ -188,6 +446,20 @@ def main():
         create_sample_structure()
         return
 
+    # Skip the whole regeneration when neither the photos tree nor the
+    # config/JS files changed since the last update
+    tree_mtime = photos_tree_mtime()
+    stamp = scan_stamp(tree_mtime)
+    if (
+        not args.force
+        and not args.scan_only
+        and tree_mtime is not None
+        and stamp["config_mtime_ns"] is not None
+        and stamp == load_scan_stamp()
+    ):
+        print("No changes in photos directory since last update (use --force)")
+        return
+
     # Load existing configuration
     existing_config = load_existing_config()
 
@@ -198,9 +470,10 @@ def main():
     merged_data = existing_config.copy()
 
     for shoot_id, shoot_data in scanned_data.items():
-        if shoot_id in merged_data:
+        existing = merged_data.get(shoot_id)
+        if existing is not None:
             # Update images but preserve manually edited metadata
-            merged_data[shoot_id]["images"] = shoot_data["images"]
+            merged_data[shoot_id] = {**existing, "images": shoot_data["images"]}
             print(f"Updated images for existing shoot: {shoot_id}")
         else:
             merged_data[shoot_id] = shoot_data
@@ -209,7 +482,10 @@ def main():
     # Save updated configuration
     if not args.scan_only:
         save_config(merged_data)
-        update_javascript_file(merged_data)
+        update_javascript_file(merged_data, full=args.force)
+        if tree_mtime is not None:
+            # Taken after the writes above, so they don't look like hand edits
+            save_scan_stamp(scan_stamp(tree_mtime))
 
     print("\nSummary:")
     print(f"Total shoots: {len(merged_data)}")
@@ -11,42 +11,115 @@ Usage: python3 release_photos.py --shoot sugar-mill-pool-home --photos path/to/p
 """
 
 import argparse
+import asyncio
 import base64
+import functools
 import hashlib
+import io
 import json
+import mmap
 import os
+import re
 import shutil
 import subprocess
 import tempfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
-# Import for AI classification
-try:
-    import openai
-    from dotenv import load_dotenv
+# openai and Pillow are imported on first use, so runs that never classify or
+# downsample (--dry-run, --preview-names) don't pay for loading them
+
+
+@functools.lru_cache(maxsize=None)
+def load_openai():
+    """Import openai for AI classification; returns None if not installed"""
+    try:
+        import openai
+        from dotenv import load_dotenv
+    except ImportError:
+        print("⚠️  OpenAI not available. Install with: pip install openai python-dotenv")
+        print("   AI classification will be skipped.")
+        return None
 
     load_dotenv()  # Load environment variables from .env file
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-    print("⚠️  OpenAI not available. Install with: pip install openai python-dotenv")
-    print("   AI classification will be skipped.")
+    return openai
 
-try:
-    from PIL import Image
 
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
-    print("⚠️  PIL/Pillow not available. Install with: pip install Pillow")
-    print("   Image downsampling will be skipped.")
+@functools.lru_cache(maxsize=None)
+def load_pil():
+    """Import Pillow for downsampling; returns None if not installed"""
+    try:
+        import PIL
+        from PIL import Image  # noqa: F401  (fails here if the C core is missing)
+    except ImportError:
+        print("⚠️  PIL/Pillow not available. Install with: pip install Pillow")
+        print("   Image downsampling will be skipped.")
+        return None
+
+    return PIL
+
+
+RELEASE_DOWNLOAD_URL = (
+    "https://github.com/smithclint/waypoint-media-site/releases/download"
+)
+
+# Number of concurrent `gh release upload` processes, and files per process
+UPLOAD_WORKERS = 8
+UPLOAD_BATCH_SIZE = 4
+
+PHOTO_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".webp"})
+
+# Vision API requests in flight at once
+CLASSIFY_CONCURRENCY = 10
+
+# Photos buffered between pipeline stages
+PIPELINE_QUEUE_SIZE = 8
+
+# Room types from earlier runs, keyed by a hash of the uploaded image bytes
+CLASSIFY_CACHE = ".classify_cache.json"
+
+_SEP_RE = re.compile(r"[-_]")
+_CAPTION_TRANSLATE = str.maketrans("-_", "  ")
+
+_VALID_ROOM_TYPES = frozenset(
+    {
+        "exterior",
+        "living",
+        "kitchen",
+        "dining",
+        "bedroom",
+        "master",
+        "bathroom",
+        "garage",
+        "closet",
+        "laundry",
+        "utility",
+        "storage",
+        "office",
+        "family",
+        "den",
+        "guest",
+        "basement",
+        "attic",
+    }
+)
+
+_CLASSIFY_PROMPT = """Classify this real estate photo. Look at the room type and respond with exactly ONE word from this list:
+exterior, living, kitchen, dining, bedroom, master, bathroom, garage, closet, laundry, utility, storage, office, family, den, guest, basement, attic
+
+Choose the most specific and accurate room type. For outdoor/exterior shots, use 'exterior'. For bedrooms that appear to be master/primary bedrooms, use 'master'. For general living areas, use 'living'. Respond with only the single word."""
 
 
+@functools.lru_cache(maxsize=None)
 def generate_unique_prefix(shoot_name, method="hash"):
     """Generate a unique prefix for photos based on shoot name"""
     if method == "hash":
-        # Create a short hash from the shoot name
-        shoot_hash = hashlib.md5(shoot_name.encode()).hexdigest()[:6]
+        # Create a short hash from the shoot name. Published asset names embed
+        # this digest, so it must stay MD5; it is an identifier, not security
+        shoot_hash = hashlib.md5(
+            shoot_name.encode(), usedforsecurity=False
+        ).hexdigest()[:6]
         return f"{shoot_name[:8]}-{shoot_hash}"
     elif method == "simple":
         # Just use the shoot name with some cleanup
@@ -73,33 +146,70 @@ def generate_prefixed_filename(original_filename, prefix, counter=None, room_typ
         parts.append(f"{counter:03d}")
 
     # Add original name (cleaned up)
-    clean_name = name.replace("-", "").replace("_", "")  # Remove existing separators
+    clean_name = _SEP_RE.sub("", name)  # Remove existing separators
     if clean_name and not clean_name.isdigit():  # Only add if it's not just a number
         parts.append(clean_name)
 
     return f"{'-'.join(parts)}{ext}"
 
 
+def link_or_copy(src, dst):
+    """Hardlink src to dst (a read-only temp copy), copying across filesystems"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
 def downsample_image(
-    input_path, output_path, max_width=1920, max_height=1080, quality=85
+    input_path,
+    output_path,
+    max_width=1920,
+    max_height=1080,
+    quality=85,
+    resample="bicubic",
+    output_format="jpeg",
 ):
     """Downsample image for web optimization"""
-    if not PIL_AVAILABLE:
-        # If PIL not available, just copy the original
-        shutil.copy2(input_path, output_path)
+    if load_pil() is None:
+        # If PIL not available, just use the original
+        link_or_copy(input_path, output_path)
         return False
 
+    from PIL import Image, ImageOps
+
     try:
         with Image.open(input_path) as img:
+            # Let libjpeg decode at 1/2, 1/4 or 1/8 scale when that still
+            # covers the target size, so far fewer pixels are materialized
+            if img.format == "JPEG":
+                img.draft("RGB", (max_width, max_height))
+
+            # EXIF is not written to the output, so bake the camera
+            # orientation into the pixels first
+            ImageOps.exif_transpose(img, in_place=True)
+
             # Convert to RGB if necessary (handles RGBA, etc.)
             if img.mode in ("RGBA", "LA", "P"):
                 img = img.convert("RGB")
 
+            if output_format == "avif":
+                save_format, save_options = "AVIF", {"quality": quality}
+            else:
+                # Progressive 4:2:0 JPEGs without metadata are the smallest output
+                save_format = "JPEG"
+                save_options = {
+                    "quality": quality,
+                    "optimize": True,
+                    "progressive": True,
+                    "subsampling": "4:2:0",
+                }
+
             # Calculate new dimensions maintaining aspect ratio
             width, height = img.size
             if width <= max_width and height <= max_height:
                 # Image is already small enough, but still optimize quality
-                img.save(output_path, "JPEG", quality=quality, optimize=True)
+                img.save(output_path, save_format, **save_options)
                 return True
 
             # Calculate resize ratio
@@ -111,89 +221,82 @@ def downsample_image(
             new_height = int(height * ratio)
 
             # Resize and save
-            resized_img = img.resize((new_width, new_height), Image.LANCZOS)
-            resized_img.save(output_path, "JPEG", quality=quality, optimize=True)
+            resized_img = img.resize(
+                (new_width, new_height), Image.Resampling[resample.upper()]
+            )
+            resized_img.save(output_path, save_format, **save_options)
 
             return True
     except Exception as e:
         print(f"   ⚠️  Error downsampling {input_path}: {e}")
-        # Fallback to copying original
-        shutil.copy2(input_path, output_path)
+        # Fallback to the original; drop any partial output first
+        if os.path.exists(output_path):
+            os.unlink(output_path)
+        link_or_copy(input_path, output_path)
         return False
 
 
-def classify_image_with_ai(image_path, max_retries=3):
-    """Classify a real estate photo using OpenAI Vision API"""
-    if not OPENAI_AVAILABLE:
-        return None
-
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        print("⚠️  OPENAI_API_KEY not found in environment variables")
-        return None
+def encode_image_for_ai(image_path, max_size=512):
+    """Base64-encode a photo for the Vision API, shrunk to the low-detail size"""
+    if load_pil() is None:
+        # Encode straight from a mapping instead of reading a copy of the file
+        with open(image_path, "rb") as image_file, mmap.mmap(
+            image_file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            return base64.b64encode(mapped).decode("utf-8")
 
-    client = openai.OpenAI(api_key=api_key)
+    from PIL import Image
 
+    # "low" detail requests are analyzed at 512px, so larger payloads are waste
+    with Image.open(image_path) as img:
+        img.draft("RGB", (max_size, max_size))
+        img = img.convert("RGB")
+        img.thumbnail((max_size, max_size))
+        buffer = io.BytesIO()
+        img.save(buffer, "JPEG", quality=85)
+    return base64.b64encode(buffer.getbuffer()).decode("utf-8")
+
+
+def _make_messages(base64_image):
+    """Build the Vision API message list; only the image payload varies"""
+    return [
+        {
+            "role": "user",
+            "content": [
+                {"type": "text", "text": _CLASSIFY_PROMPT},
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": f"data:image/jpeg;base64,{base64_image}",
+                        "detail": "low",  # Use low detail to reduce costs
+                    },
+                },
+            ],
+        }
+    ]
+
+
+async def classify_image_with_ai_async(client, image_path, semaphore, max_retries=3):
+    """Classify a real estate photo using OpenAI Vision API"""
     try:
-        # Convert image to base64
-        with open(image_path, "rb") as image_file:
-            base64_image = base64.b64encode(image_file.read()).decode("utf-8")
+        # Convert image to base64 (off the event loop; it may resize)
+        base64_image = await asyncio.to_thread(encode_image_for_ai, image_path)
 
         # Retry logic for API calls
         for attempt in range(max_retries):
             try:
-                response = client.chat.completions.create(
-                    model="gpt-4o-mini",  # Using the more cost-effective model
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": """Classify this real estate photo. Look at the room type and respond with exactly ONE word from this list:
-exterior, living, kitchen, dining, bedroom, master, bathroom, garage, closet, laundry, utility, storage, office, family, den, guest, basement, attic
-
-Choose the most specific and accurate room type. For outdoor/exterior shots, use 'exterior'. For bedrooms that appear to be master/primary bedrooms, use 'master'. For general living areas, use 'living'. Respond with only the single word.""",
-                                },
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/jpeg;base64,{base64_image}",
-                                        "detail": "low",  # Use low detail to reduce costs
-                                    },
-                                },
-                            ],
-                        }
-                    ],
-                    max_tokens=10,
-                    temperature=0,  # Make it deterministic
-                )
+                async with semaphore:
+                    response = await client.chat.completions.create(
+                        model="gpt-4o-mini",  # Using the more cost-effective model
+                        messages=_make_messages(base64_image),
+                        max_tokens=10,
+                        temperature=0,  # Make it deterministic
+                    )
 
                 classification = response.choices[0].message.content.strip().lower()
 
                 # Validate the response is one of our expected room types
-                valid_types = {
-                    "exterior",
-                    "living",
-                    "kitchen",
-                    "dining",
-                    "bedroom",
-                    "master",
-                    "bathroom",
-                    "garage",
-                    "closet",
-                    "laundry",
-                    "utility",
-                    "storage",
-                    "office",
-                    "family",
-                    "den",
-                    "guest",
-                    "basement",
-                    "attic",
-                }
-
-                if classification in valid_types:
+                if classification in _VALID_ROOM_TYPES:
                     return classification
                 else:
                     print(
@@ -218,19 +321,213 @@ Choose the most specific and accurate room type. For outdoor/exterior shots, use
         return None
 
 
+def load_classify_cache():
+    """Load the content-hash → room type cache from previous runs"""
+    try:
+        with open(CLASSIFY_CACHE, "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_classify_cache(cache):
+    """Persist the content-hash → room type cache"""
+    with open(CLASSIFY_CACHE, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+
+def image_content_key(image_path):
+    """Hash image bytes so identical photos share a cached classification"""
+    with open(image_path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
 def get_existing_release_assets(tag_name):
-    """Get list of existing assets in the GitHub release"""
+    """Get the names of existing assets in the GitHub release.
+
+    Returns None if the release does not exist.
+    """
     try:
         result = subprocess.run(
-            ["gh", "release", "view", tag_name, "--json", "assets"],
+            [
+                "gh",
+                "release",
+                "view",
+                tag_name,
+                "--json",
+                "assets",
+                "--jq",
+                ".assets[].name",
+            ],
             capture_output=True,
             text=True,
             check=True,
         )
-        release_data = json.loads(result.stdout)
-        return [asset["name"] for asset in release_data.get("assets", [])]
-    except (subprocess.CalledProcessError, json.JSONDecodeError):
-        return []
+        return set(result.stdout.splitlines())
+    except subprocess.CalledProcessError:
+        return None
+
+
+async def process_and_upload_photos(
+    tag_name, jobs, downsample_options=None, classify_prefix=None
+):
+    """Downsample, classify and upload photos as a pipeline of async stages.
+
+    Each stage runs a fixed number of workers and hands finished photos to
+    the next through a bounded queue, so resizing, Vision API calls and gh
+    uploads overlap instead of running one after another, while a slow stage
+    holds the earlier ones back. jobs holds (photo_data, original_path, temp_file_path)
+    tuples; photo_data["filename"] is updated with the final asset name.
+    Returns (uploaded_files, failed_files, downsampled_count).
+    """
+    loop = asyncio.get_running_loop()
+    classify_queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    upload_queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    uploaded_files = []
+    failed_files = []
+    downsampled_count = 0
+
+    client = None
+    cache = {}
+    new_cache_entries = {}
+    if classify_prefix is not None:
+        cache = load_classify_cache()
+        if os.getenv("OPENAI_API_KEY"):
+            client = load_openai().AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        else:
+            print("⚠️  OPENAI_API_KEY not found in environment variables")
+    api_slots = asyncio.Semaphore(CLASSIFY_CONCURRENCY)
+
+    # Resizing is CPU-bound, so spread it across one process per core
+    prepare_workers = os.cpu_count() or 1
+    pool = (
+        ProcessPoolExecutor(max_workers=prepare_workers) if downsample_options else None
+    )
+
+    async def prepare_one(photo_data, original_path, temp_file_path):
+        nonlocal downsampled_count
+        if pool is None:
+            # The temp file is never modified here, so a hardlink is enough
+            link_or_copy(original_path, temp_file_path)
+        elif await loop.run_in_executor(
+            pool,
+            downsample_image,
+            str(original_path),
+            str(temp_file_path),
+            *downsample_options,
+        ):
+            downsampled_count += 1
+        await classify_queue.put((photo_data, Path(temp_file_path)))
+
+    async def prepare_worker(pending):
+        # Workers share one iterator, so each job is taken exactly once
+        for job in pending:
+            await prepare_one(*job)
+
+    async def prepare():
+        pending = iter(jobs)
+        await asyncio.gather(*[prepare_worker(pending) for _ in range(prepare_workers)])
+        for _ in range(CLASSIFY_CONCURRENCY):
+            await classify_queue.put(None)
+
+    async def classify_one(photo_data, temp_path):
+        if classify_prefix is not None:
+            key = await asyncio.to_thread(image_content_key, temp_path)
+            room_type = cache.get(key)
+            if room_type is None and client is not None:
+                room_type = await classify_image_with_ai_async(
+                    client, str(temp_path), api_slots
+                )
+                if room_type:
+                    new_cache_entries[key] = room_type
+
+            if room_type:
+                print(f"   ✅ {temp_path.name} classified as: {room_type}")
+
+                # Rename the temp file with room classification, keeping its
+                # suffix (downsampled files are always .jpg)
+                new_filename = generate_prefixed_filename(
+                    Path(photo_data["original_filename"]).stem + temp_path.suffix,
+                    classify_prefix,
+                    room_type=room_type,
+                )
+                new_temp_path = temp_path.parent / new_filename
+                temp_path.rename(new_temp_path)
+                temp_path = new_temp_path
+
+                # Update the photo_urls data for consistency
+                photo_data["filename"] = new_filename
+            else:
+                print(
+                    f"   ⚠️  Could not classify {temp_path.name}, keeping original name"
+                )
+        await upload_queue.put(str(temp_path))
+
+    async def classify_worker():
+        while True:
+            item = await classify_queue.get()
+            if item is None:
+                return
+            await classify_one(*item)
+
+    async def classify():
+        await asyncio.gather(*[classify_worker() for _ in range(CLASSIFY_CONCURRENCY)])
+        await upload_queue.put(None)
+
+    async def upload_batch(batch):
+        try:
+            await asyncio.to_thread(
+                subprocess.run,
+                ["gh", "release", "upload", tag_name, "--clobber"] + batch,
+                stdout=subprocess.DEVNULL,  # stderr streams gh progress/errors
+                check=True,
+            )
+            uploaded_files.extend(batch)
+        except subprocess.CalledProcessError as e:
+            print(f"❌ Failed to upload {len(batch)} files: {e}")
+            failed_files.extend(batch)
+
+    async def upload_worker(batch_queue):
+        while True:
+            batch = await batch_queue.get()
+            if batch is None:
+                return
+            await upload_batch(batch)
+
+    async def upload():
+        # gh sends the assets of one invocation serially, so run several
+        batch_queue = asyncio.Queue(maxsize=UPLOAD_WORKERS)
+        workers = [
+            asyncio.create_task(upload_worker(batch_queue))
+            for _ in range(UPLOAD_WORKERS)
+        ]
+        batch = []
+        while True:
+            temp_file = await upload_queue.get()
+            if temp_file is None:
+                break
+            batch.append(temp_file)
+            if len(batch) == UPLOAD_BATCH_SIZE:
+                await batch_queue.put(batch)
+                batch = []
+        if batch:
+            await batch_queue.put(batch)
+        for _ in workers:
+            await batch_queue.put(None)
+        await asyncio.gather(*workers)
+
+    try:
+        await asyncio.gather(prepare(), classify(), upload())
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if client is not None:
+            await client.close()
+        if new_cache_entries:
+            cache.update(new_cache_entries)
+            save_classify_cache(cache)
+
+    return uploaded_files, failed_files, downsampled_count
 
 
 def upload_photos_to_release(
@@ -243,36 +540,42 @@ def upload_photos_to_release(
     quality=85,
     no_downsample=False,
     use_ai_classification=False,
+    resample="bicubic",
+    output_format="jpeg",
 ):
     """Upload photos to GitHub release using GitHub CLI"""
     print(f"\n📤 Preparing to upload {len(photo_urls)} photos to release...")
 
-    # Check if GitHub CLI is installed
-    try:
-        subprocess.run(["gh", "--version"], capture_output=True, check=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print("❌ GitHub CLI (gh) not found. Please install it first:")
-        print("   brew install gh")
-        print("   Then authenticate: gh auth login")
-        return False
+    # Listing the release assets doubles as the existence check; index the
+    # photos directory while gh runs
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assets_future = executor.submit(get_existing_release_assets, tag_name)
 
-    # Check if release exists, create if it doesn't
-    try:
-        result = subprocess.run(
-            ["gh", "release", "view", tag_name],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        files_by_name = {}
+        for photo_file in Path(base_photos_dir).rglob("*"):
+            if photo_file.is_file():
+                files_by_name.setdefault(photo_file.name, photo_file)
+
+        try:
+            existing_assets = assets_future.result()
+        except FileNotFoundError:
+            print("❌ GitHub CLI (gh) not found. Please install it first:")
+            print("   brew install gh")
+            print("   Then authenticate: gh auth login")
+            return False
+
+    # Create the release if it doesn't exist
+    if existing_assets is not None:
         print(f"   ✅ Release {tag_name} already exists")
-    except subprocess.CalledProcessError:
-        # Release doesn't exist, create it
+        print(f"   📋 Found {len(existing_assets)} existing assets in release")
+    else:
         print(f"   🆕 Creating new release {tag_name}...")
         try:
             # Extract shoot name for title
             shoot_name = tag_name.replace("real-estate-", "").replace("-v1.0", "")
-            title = f"{shoot_name.replace('-', ' ').title()} - Real Estate Photos"
-            notes = f"Professional aerial photography showcasing {shoot_name.replace('-', ' ')}. {len(photo_urls)} high-quality photos featuring exterior views, architectural details, and property highlights."
+            shoot_pretty = shoot_name.replace("-", " ")
+            title = f"{shoot_pretty.title()} - Real Estate Photos"
+            notes = f"Professional aerial photography showcasing {shoot_pretty}. {len(photo_urls)} high-quality photos featuring exterior views, architectural details, and property highlights."
 
             create_cmd = [
                 "gh",
@@ -284,53 +587,45 @@ def upload_photos_to_release(
                 "--notes",
                 notes,
             ]
-            subprocess.run(create_cmd, capture_output=True, text=True, check=True)
+            subprocess.run(
+                create_cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                check=True,
+            )
             print(f"   ✅ Created release {tag_name}")
         except subprocess.CalledProcessError as e:
             print(f"   ❌ Failed to create release: {e}")
             if e.stderr:
                 print(f"   Error details: {e.stderr}")
             return False
+        existing_assets = set()
 
-    # Get existing assets in the release
-    existing_assets = get_existing_release_assets(tag_name)
-    print(f"   📋 Found {len(existing_assets)} existing assets in release")
+    # Downsampled photos are converted to .jpg (or .avif) for consistency and
+    # smaller file size, and uploaded under that name
+    output_suffix = None
+    if not no_downsample:
+        output_suffix = ".avif" if output_format == "avif" else ".jpg"
 
     # Filter out photos that already exist (unless force_reupload)
     photos_to_upload = []
     skipped_photos = []
-    photos_to_delete = []
 
     if force_reupload:
+        # Uploads use --clobber, which replaces existing assets in place
         print("   🔄 Force re-upload mode: will replace existing photos")
         photos_to_upload = photo_urls
-        # Mark existing photos for deletion
-        for photo_data in photo_urls:
-            if photo_data["filename"] in existing_assets:
-                photos_to_delete.append(photo_data["filename"])
     else:
         for photo_data in photo_urls:
-            if photo_data["filename"] in existing_assets:
-                skipped_photos.append(photo_data["filename"])
+            upload_name = photo_data["filename"]
+            if output_suffix:
+                upload_name = Path(upload_name).with_suffix(output_suffix).name
+            if upload_name in existing_assets:
+                skipped_photos.append(upload_name)
             else:
                 photos_to_upload.append(photo_data)
 
-    # Delete existing photos if force re-upload
-    if photos_to_delete:
-        print(
-            f"   🗑️  Deleting {len(photos_to_delete)} existing photos for re-upload..."
-        )
-        try:
-            delete_cmd = (
-                ["gh", "release", "delete-asset", tag_name]
-                + photos_to_delete
-                + ["--yes"]
-            )
-            subprocess.run(delete_cmd, capture_output=True, text=True, check=True)
-            print(f"   ✅ Deleted {len(photos_to_delete)} existing photos")
-        except subprocess.CalledProcessError as e:
-            print(f"   ⚠️  Warning: Could not delete some existing photos: {e}")
-
     if skipped_photos:
         print(f"   ⏭️  Skipping {len(skipped_photos)} photos that already exist:")
         for filename in skipped_photos[:5]:  # Show first 5
@@ -350,21 +645,10 @@ def upload_photos_to_release(
     with tempfile.TemporaryDirectory() as temp_dir:
         print(f"   📁 Creating temporary renamed files...")
 
-        # Copy and rename files to temp directory with downsampling
-        temp_files = []
-        downsampled_count = 0
-
+        # Map each photo to its temp file; the pipeline fills them in
+        jobs = []
         for photo_data in photos_to_upload:
-            original_path = None
-
-            # Find the original file path
-            for photo_file in Path(base_photos_dir).glob("**/*"):
-                if (
-                    photo_file.is_file()
-                    and photo_file.name == photo_data["original_filename"]
-                ):
-                    original_path = photo_file
-                    break
+            original_path = files_by_name.get(photo_data["original_filename"])
 
             if not original_path:
                 print(
@@ -375,92 +659,61 @@ def upload_photos_to_release(
             # Process and save file with new name to temp directory
             temp_file_path = Path(temp_dir) / photo_data["filename"]
 
-            if no_downsample:
-                # Just copy without downsampling
-                shutil.copy2(original_path, temp_file_path)
-            else:
-                # Convert to .jpg for consistency and smaller file size
-                temp_file_path = temp_file_path.with_suffix(".jpg")
+            if output_suffix:
+                temp_file_path = temp_file_path.with_suffix(output_suffix)
                 photo_data["filename"] = temp_file_path.name  # Update filename in data
 
-                if downsample_image(
-                    original_path, temp_file_path, max_width, max_height, quality
-                ):
-                    downsampled_count += 1
-
-            temp_files.append(str(temp_file_path))
+            jobs.append((photo_data, original_path, temp_file_path))
 
-        if not temp_files:
+        if not jobs:
             print("❌ No new files to upload")
             return (
                 len(skipped_photos) > 0
             )  # Return True if we skipped files (means some success)
 
-        if downsampled_count > 0:
-            print(f"   🔧 Downsampled {downsampled_count} images for web optimization")
+        downsample_options = None
+        if not no_downsample:
+            downsample_options = (
+                max_width,
+                max_height,
+                quality,
+                resample,
+                output_format,
+            )
+            pil = load_pil()
+            if pil is not None:
+                # Pillow-SIMD is a drop-in replacement; its releases carry a
+                # ".postN" suffix
+                build = "Pillow-SIMD" if ".post" in pil.__version__ else "Pillow"
+                print(f"   🔧 Downsampling with {build} {pil.__version__}")
 
         # AI Classification of downsampled images if requested
-        if use_ai_classification and OPENAI_AVAILABLE:
-            print(f"   🤖 Classifying {len(temp_files)} downsampled images...")
-            classified_files = []
-
-            for i, temp_file_path in enumerate(temp_files):
-                temp_path = Path(temp_file_path)
-                original_photo_data = photo_urls[i]
-
-                print(f"   🤖 Classifying {temp_path.name}...")
-                room_type = classify_image_with_ai(str(temp_path))
-
-                if room_type:
-                    print(f"   ✅ Classified as: {room_type}")
-
-                    # Generate new filename with room classification
-                    shoot_name = tag_name.replace("real-estate-", "").replace(
-                        "-v1.0", ""
-                    )
-                    prefix = generate_unique_prefix(shoot_name, "hash")
-
-                    new_filename = generate_prefixed_filename(
-                        original_photo_data["original_filename"],
-                        prefix,
-                        room_type=room_type,
-                    )
-
-                    # Rename the temp file
-                    new_temp_path = temp_path.parent / new_filename
-                    temp_path.rename(new_temp_path)
-                    classified_files.append(str(new_temp_path))
+        classify_prefix = None
+        if use_ai_classification and load_openai() is not None:
+            print(f"   🤖 Classifying {len(jobs)} downsampled images...")
+            shoot_name = tag_name.replace("real-estate-", "").replace("-v1.0", "")
+            classify_prefix = generate_unique_prefix(shoot_name, "hash")
 
-                    # Update the photo_urls data for consistency
-                    photo_urls[i]["filename"] = new_filename
-                else:
-                    print(f"   ⚠️  Could not classify, keeping original name")
-                    classified_files.append(temp_file_path)
+        print(f"   🚀 Uploading {len(jobs)} new files to release {tag_name}...")
+        uploaded_files, failed_files, downsampled_count = asyncio.run(
+            process_and_upload_photos(
+                tag_name, jobs, downsample_options, classify_prefix
+            )
+        )
 
-            temp_files = classified_files
+        if downsampled_count > 0:
+            print(f"   🔧 Downsampled {downsampled_count} images for web optimization")
 
-        print(f"   📸 Prepared {len(temp_files)} files for upload")
+        if failed_files:
+            print(f"   📊 Uploaded {len(uploaded_files)} of {len(jobs)} new photos")
+            return False
 
-        # Upload files to release using GitHub CLI
-        try:
-            cmd = ["gh", "release", "upload", tag_name] + temp_files
+        print(f"✅ Successfully uploaded {len(uploaded_files)} new photos!")
+        if skipped_photos:
             print(
-                f"   🚀 Uploading {len(temp_files)} new files to release {tag_name}..."
+                f"   📊 Total: {len(uploaded_files)} uploaded + {len(skipped_photos)} existing = {len(photo_urls)} total photos"
             )
-
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            print(f"✅ Successfully uploaded {len(temp_files)} new photos!")
-            if skipped_photos:
-                print(
-                    f"   📊 Total: {len(temp_files)} uploaded + {len(skipped_photos)} existing = {len(photo_urls)} total photos"
-                )
-            return True
-
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Failed to upload files: {e}")
-            if e.stderr:
-                print(f"   Error details: {e.stderr}")
-            return False
+        return True
 
 
 def create_release_tag(shoot_name, version="v1.0"):
@@ -486,6 +739,11 @@ def create_release_tag(shoot_name, version="v1.0"):
         return None
 
 
+def release_asset_url(tag_name, filename):
+    """Download URL of a file attached to a GitHub release"""
+    return f"{RELEASE_DOWNLOAD_URL}/{tag_name}/{filename}"
+
+
 def generate_github_urls(
     shoot_name,
     photo_files,
@@ -495,86 +753,81 @@ def generate_github_urls(
     prefix_method="hash",
     sequential_numbering=False,
     use_ai_classification=False,
+    names_only=False,
 ):
-    """Generate GitHub release URLs for photos with unique prefixes"""
-    base_url = "https://github.com/smithclint/waypoint-media-site/releases/download"
+    """Generate GitHub release entries for photos with unique prefixes.
+
+    Download URLs are not stored; build them with release_asset_url when needed.
+
+    With names_only, return (original_filename, new_filename) tuples instead
+    of full photo entries.
+    """
     urls = []
 
     # Generate unique prefix for this shoot
     if use_prefix:
         prefix = generate_unique_prefix(shoot_name, prefix_method)
 
-    for counter, photo_file in enumerate(photo_files, 1):
-        original_filename = os.path.basename(photo_file)
+    base_path = Path(base_photos_dir)
+
+    # Sequence numbers for the filenames, or None for every photo when disabled
+    if sequential_numbering:
+        counters = range(1, len(photo_files) + 1)
+    else:
+        counters = [None] * len(photo_files)
+
+    for counter, photo_file in zip(counters, photo_files):
+        photo_path = Path(photo_file)
+        original_filename = photo_path.name
 
         # Generate new filename with prefix (no AI classification here - done later)
         if use_prefix:
-            if sequential_numbering:
-                new_filename = generate_prefixed_filename(
-                    original_filename, prefix, counter
-                )
-            else:
-                new_filename = generate_prefixed_filename(original_filename, prefix)
+            new_filename = generate_prefixed_filename(
+                original_filename, prefix, counter
+            )
         else:
             new_filename = original_filename
 
-        url = f"{base_url}/{tag_name}/{new_filename}"
-
-        # Generate caption with subdirectory context
-        photo_path = Path(photo_file)
-        base_path = Path(base_photos_dir)
+        if names_only:
+            urls.append((original_filename, new_filename))
+            continue
 
-        # Get relative path from base directory
+        # Get parent directory name relative to the base directory, if any
         try:
             relative_path = photo_path.relative_to(base_path)
-            # Get parent directory name if it exists
-            if len(relative_path.parts) > 1:
-                subdir = relative_path.parent.name
-                # Clean up filename for caption (use original name, not prefixed)
-                file_caption = (
-                    original_filename.replace(".jpg", "")
-                    .replace(".jpeg", "")
-                    .replace(".png", "")
-                    .replace(".webp", "")
-                )
-                file_caption = file_caption.replace("-", " ").replace("_", " ").title()
-                # Combine subdirectory and filename
-                caption = f"{subdir.replace('-', ' ').replace('_', ' ').title()} - {file_caption}"
-            else:
-                # No subdirectory, just use filename
-                caption = (
-                    original_filename.replace(".jpg", "")
-                    .replace(".jpeg", "")
-                    .replace(".png", "")
-                    .replace(".webp", "")
-                )
-                caption = caption.replace("-", " ").replace("_", " ").title()
+            subdir = relative_path.parent.name if len(relative_path.parts) > 1 else None
         except ValueError:
             # Fallback if relative path calculation fails
-            caption = (
-                original_filename.replace(".jpg", "")
-                .replace(".jpeg", "")
-                .replace(".png", "")
-                .replace(".webp", "")
-            )
-            caption = caption.replace("-", " ").replace("_", " ").title()
+            subdir = None
+
+        # Clean up filename for caption (use original name, not prefixed)
+        caption = photo_path.stem.translate(_CAPTION_TRANSLATE).title()
+        if subdir:
+            # Combine subdirectory and filename
+            caption = f"{subdir.translate(_CAPTION_TRANSLATE).title()} - {caption}"
 
         urls.append(
             {
-                "url": url,
                 "caption": caption,
                 "filename": new_filename,
                 "original_filename": original_filename,
-                "subdirectory": (
-                    relative_path.parent.name if len(relative_path.parts) > 1 else None
-                ),
-                "counter": counter if sequential_numbering else None,
+                "subdirectory": subdir,
+                "counter": counter,
             }
         )
 
     return urls
 
 
+def format_json(data):
+    """Format data as indented JSON, using orjson's C encoder when installed"""
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(data, indent=2)
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+
+
 def update_photos_json(shoot_id, shoot_data):
     """Update photos.json with new shoot data"""
     photos_file = "photos.json"
@@ -596,6 +849,33 @@ def update_photos_json(shoot_id, shoot_data):
     print(f"✅ Updated {photos_file} with {shoot_id} data")
 
 
+def find_photo_files(photos_dir, max_depth=None):
+    """Recursively list image files under photos_dir in one directory walk.
+
+    max_depth limits how many subdirectory levels are searched (0 means only
+    photos_dir itself; None means unlimited). Symlinked directories are not
+    descended into.
+    """
+    photo_files = []
+    pending = [(photos_dir, 0)]
+    while pending:
+        directory, depth = pending.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError as e:
+            # Unreadable or vanished directories are skipped, not fatal
+            print(f"   ⚠️  Warning: Skipping {directory}: {e.strerror}")
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if max_depth is None or depth < max_depth:
+                        pending.append((entry.path, depth + 1))
+                elif os.path.splitext(entry.name)[1].lower() in PHOTO_EXTENSIONS:
+                    photo_files.append(entry.path)
+    return photo_files
+
+
 def main():
     parser = argparse.ArgumentParser(description="Prepare photos for GitHub releases")
     parser.add_argument(
@@ -701,6 +981,18 @@ def main():
         action="store_true",
         help="Skip image downsampling (upload original sizes)",
     )
+    parser.add_argument(
+        "--resample",
+        default="bicubic",
+        choices=["lanczos", "bicubic", "bilinear"],
+        help="Resampling filter for downsampled images (default: bicubic)",
+    )
+    parser.add_argument(
+        "--format",
+        default="jpeg",
+        choices=["jpeg", "avif"],
+        help="Output format for downsampled images (default: jpeg)",
+    )
     parser.add_argument(
         "--ai-classify",
         action="store_true",
@@ -709,34 +1001,23 @@ def main():
 
     args = parser.parse_args()
 
+    if args.format == "avif" and not args.no_downsample:
+        avif_supported = False
+        if load_pil() is not None:
+            from PIL import features
+
+            avif_supported = features.check("avif")
+        if not avif_supported:
+            print("⚠️  This Pillow build has no AVIF support, using JPEG instead")
+            args.format = "jpeg"
+
     # Validate photos directory
     if not os.path.exists(args.photos):
         print(f"❌ Photos directory not found: {args.photos}")
         return
 
     # Find photo files (recursive search)
-    photo_extensions = [".jpg", ".jpeg", ".png", ".webp"]
-    photo_files = []
-
-    # Build glob pattern based on max_depth
-    if args.max_depth:
-        # Create pattern with limited depth
-        patterns = []
-        for depth in range(args.max_depth + 1):
-            if depth == 0:
-                patterns.append("*")
-            else:
-                patterns.append("*/" * depth + "*")
-
-        for pattern in patterns:
-            for ext in photo_extensions:
-                photo_files.extend(Path(args.photos).glob(f"{pattern}{ext}"))
-                photo_files.extend(Path(args.photos).glob(f"{pattern}{ext.upper()}"))
-    else:
-        # Unlimited depth recursive search
-        for ext in photo_extensions:
-            photo_files.extend(Path(args.photos).glob(f"**/*{ext}"))
-            photo_files.extend(Path(args.photos).glob(f"**/*{ext.upper()}"))
+    photo_files = find_photo_files(args.photos, args.max_depth)
 
     if not photo_files:
         print(f"❌ No photo files found in {args.photos}")
@@ -746,7 +1027,7 @@ def main():
     print(f"📸 Found {len(photo_files)} photos:")
 
     # Group photos by subdirectory for better display
-    photos_by_dir = {}
+    photos_by_dir = defaultdict(list)
     for photo in photo_files:
         photo_path = Path(photo)
         base_path = Path(args.photos)
@@ -757,13 +1038,9 @@ def main():
             else:
                 subdir = "root"
 
-            if subdir not in photos_by_dir:
-                photos_by_dir[subdir] = []
             photos_by_dir[subdir].append(os.path.basename(photo))
         except ValueError:
-            photos_by_dir["root"] = photos_by_dir.get("root", []) + [
-                os.path.basename(photo)
-            ]
+            photos_by_dir["root"].append(os.path.basename(photo))
 
     # Display organized by directory
     for subdir, files in photos_by_dir.items():
@@ -799,6 +1076,10 @@ def main():
     # Generate URLs with prefix options
     use_prefix = not args.no_prefix
     include_subdir = args.include_subdir and not args.no_subdir
+    shoot_pretty = args.shoot.replace("-", " ")
+    shoot_prefix = (
+        generate_unique_prefix(args.shoot, args.prefix_method) if use_prefix else None
+    )
 
     if not include_subdir:
         # Use simplified function without subdirectory context
@@ -811,47 +1092,42 @@ def main():
             prefix_method,
             sequential_numbering,
             use_ai_classification=False,
+            names_only=False,
         ):
             urls = []
-            base_url = (
-                "https://github.com/smithclint/waypoint-media-site/releases/download"
-            )
 
             if use_prefix:
                 prefix = generate_unique_prefix(shoot_name, prefix_method)
 
-            for counter, photo_file in enumerate(photo_files, 1):
+            if sequential_numbering:
+                counters = range(1, len(photo_files) + 1)
+            else:
+                counters = [None] * len(photo_files)
+
+            for counter, photo_file in zip(counters, photo_files):
                 original_filename = os.path.basename(photo_file)
 
                 if use_prefix:
-                    if sequential_numbering:
-                        new_filename = generate_prefixed_filename(
-                            original_filename, prefix, counter
-                        )
-                    else:
-                        new_filename = generate_prefixed_filename(
-                            original_filename, prefix
-                        )
+                    new_filename = generate_prefixed_filename(
+                        original_filename, prefix, counter
+                    )
                 else:
                     new_filename = original_filename
 
-                url = f"{base_url}/{tag_name}/{new_filename}"
-                caption = (
-                    original_filename.replace(".jpg", "")
-                    .replace(".jpeg", "")
-                    .replace(".png", "")
-                    .replace(".webp", "")
-                )
-                caption = caption.replace("-", " ").replace("_", " ").title()
+                if names_only:
+                    urls.append((original_filename, new_filename))
+                    continue
+
+                stem, _ = os.path.splitext(original_filename)
+                caption = stem.translate(_CAPTION_TRANSLATE).title()
 
                 urls.append(
                     {
-                        "url": url,
                         "caption": caption,
                         "filename": new_filename,
                         "original_filename": original_filename,
                         "subdirectory": None,
-                        "counter": counter if sequential_numbering else None,
+                        "counter": counter,
                     }
                 )
             return urls
@@ -865,6 +1141,7 @@ def main():
             args.prefix_method,
             args.sequential,
             args.ai_classify,
+            names_only=args.preview_names,
         )
     else:
         photo_urls = generate_github_urls(
@@ -876,14 +1153,14 @@ def main():
             args.prefix_method,
             args.sequential,
             args.ai_classify,
+            names_only=args.preview_names,
         )
 
     # Show filename preview if requested
     if args.preview_names:
         print(f"\n📝 Filename mapping for shoot '{args.shoot}':")
         if use_prefix:
-            prefix = generate_unique_prefix(args.shoot, args.prefix_method)
-            print(f"   Prefix: {prefix}")
+            print(f"   Prefix: {shoot_prefix}")
             print(f"   Method: {args.prefix_method}")
             if args.sequential:
                 print(f"   Sequential numbering: enabled")
@@ -891,22 +1168,18 @@ def main():
             print("   No prefixes will be added")
 
         print(f"\n   Original → New filename:")
-        for photo_data in photo_urls:
-            print(f"   {photo_data['original_filename']} → {photo_data['filename']}")
+        # Only names were generated for the preview
+        print("\n".join(f"   {orig} → {new}" for orig, new in photo_urls))
         return
 
     # Prepare shoot data with simplified structure
     shoot_data = {
-        "title": args.title or args.shoot.replace("-", " ").title(),
+        "title": args.title or shoot_pretty.title(),
         "description": args.description
-        or f"Professional aerial photography of {args.shoot.replace('-', ' ')}",
+        or f"Professional aerial photography of {shoot_pretty}",
         "category": args.category,
         "release_tag": tag_name,
-        "shoot_prefix": (
-            generate_unique_prefix(args.shoot, args.prefix_method)
-            if use_prefix
-            else None
-        ),
+        "shoot_prefix": shoot_prefix,
         "featured_photo_index": args.featured_photo,
     }
 
@@ -915,7 +1188,7 @@ def main():
         update_photos_json(args.shoot, shoot_data)
     elif not args.upload_only:
         print(f"\n📄 Would update photos.json with:")
-        print(json.dumps({args.shoot: shoot_data}, indent=2))
+        print(format_json({args.shoot: shoot_data}))
 
     # Auto-upload photos if requested
     if args.auto_upload and not args.dry_run and not args.preview_names:
@@ -929,6 +1202,8 @@ def main():
             args.quality,
             args.no_downsample,
             args.ai_classify,
+            args.resample,
+            args.format,
         )
         if upload_success:
             print(f"\n🎉 Complete! Photos uploaded and website updated.")
@@ -957,6 +1232,8 @@ def main():
                 args.quality,
                 args.no_downsample,
                 args.ai_classify,
+                args.resample,
+                args.format,
             )
         return
 
@@ -973,26 +1250,33 @@ def main():
     else:
         print(f"3. Upload these files (keep original names):")
 
-    # Group files by subdirectory for upload instructions
-    files_by_dir = {}
-    for photo_data in photo_urls:
-        subdir = photo_data.get("subdirectory", "root")
-        if subdir not in files_by_dir:
-            files_by_dir[subdir] = []
-        files_by_dir[subdir].append(photo_data)
+    # Group files by subdirectory for upload instructions; without subdirectories
+    # everything lands in one bucket, so skip the grouping and its folder headers
+    used_no_subdir = not include_subdir
+    if used_no_subdir:
+        files_by_dir = {"root": photo_urls}
+    else:
+        files_by_dir = defaultdict(list)
+        for photo_data in photo_urls:
+            files_by_dir[photo_data["subdirectory"] or "root"].append(photo_data)
 
+    # Collect the listing and write it in one go rather than a print per photo
+    lines = []
     file_num = 1
     for subdir, photo_data_list in files_by_dir.items():
-        if subdir != "root" and subdir is not None:
-            print(f"   📁 From {subdir}/ folder:")
+        if subdir != "root":
+            lines.append(f"   📁 From {subdir}/ folder:")
         for photo_data in photo_data_list:
-            if use_prefix and photo_data["filename"] != photo_data["original_filename"]:
-                print(
-                    f"   {file_num}. {photo_data['original_filename']} → RENAME TO → {photo_data['filename']}"
+            original_filename = photo_data["original_filename"]
+            filename = photo_data["filename"]
+            if use_prefix and filename != original_filename:
+                lines.append(
+                    f"   {file_num}. {original_filename} → RENAME TO → {filename}"
                 )
             else:
-                print(f"   {file_num}. {photo_data['filename']}")
+                lines.append(f"   {file_num}. {filename}")
             file_num += 1
+    print("\n".join(lines))
 
     print(f"\n4. Commit and push photos.json changes:")
     print(f"   git add photos.json")
@@ -1000,8 +1284,12 @@ def main():
     print(f"   git push origin main")
 
     print(f"\n🌐 Photos will be available at:")
-    for photo_data in photo_urls:
-        print(f"   {photo_data['url']}")
+    print(
+        "\n".join(
+            f"   {release_asset_url(tag_name, photo_data['filename'])}"
+            for photo_data in photo_urls
+        )
+    )
 
 
 if __name__ == "__main__":
@@ -9,12 +9,16 @@ Usage: python3 release_photos_s3.py --shoot open-range-rv --photos path/to/photo
 """
 
 import argparse
+import asyncio
 import base64
+import functools
 import hashlib
+import io
 import json
 import os
-import shutil
 import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
 # Import for AI classification
@@ -40,6 +44,8 @@ except ImportError:
 
 try:
     import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config as BotocoreConfig
     from botocore.exceptions import ClientError, NoCredentialsError
 
     BOTO3_AVAILABLE = True
@@ -51,8 +57,70 @@ except ImportError:
 # Configuration
 S3_BUCKET = os.getenv("S3_BUCKET", "waypoint-media-pro")  # Default bucket name
 CLOUDFRONT_DOMAIN = "https://d1fp8ti9bzsng5.cloudfront.net"
+CLOUDFRONT_DISTRIBUTION_ID = os.getenv("CLOUDFRONT_DISTRIBUTION_ID")
 PHOTOS_CONFIG = "config/photos.json"
 
+# Room types from earlier runs, keyed by sha256 of the downsampled image bytes
+CLASSIFY_CACHE = os.path.join(os.path.dirname(PHOTOS_CONFIG), ".ai-classify-cache.json")
+
+# Photos processed and uploaded concurrently
+UPLOAD_WORKERS = 16
+
+PHOTO_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".webp"})
+
+# Files at least this large upload in parts of this size, a few parts at a time.
+# Concurrency stacks per photo, so keep UPLOAD_WORKERS * MULTIPART_CONCURRENCY
+# S3 connections (32) rather than boto3's default 10 threads per file
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+MULTIPART_CONCURRENCY = 2
+
+# Vision API requests in flight at once
+CLASSIFY_CONCURRENCY = 10
+
+# OpenAI per-minute limits for the account (defaults: gpt-4o-mini, tier 1)
+OPENAI_REQUESTS_PER_MINUTE = int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "500"))
+OPENAI_TOKENS_PER_MINUTE = int(os.getenv("OPENAI_TOKENS_PER_MINUTE", "200000"))
+
+# Largest image sent to the Vision API as-is; bigger ones (e.g. --no-downsample
+# originals) are shrunk first, since "low" detail only looks at 512px anyway
+MAX_VISION_PAYLOAD_BYTES = 2_000_000
+
+# Tokens counted against the per-minute limit when classifying: gpt-4o-mini
+# bills every low-detail image at a flat 2,833 input tokens (OpenAI's vision
+# pricing), plus the instructions (~130 tokens) and the reply's max_tokens
+CLASSIFY_IMAGE_TOKENS = 2833
+CLASSIFY_PROMPT_TOKENS = 150
+
+# Photos per Vision API request, and how long a partly filled batch waits for
+# more photos to finish downsampling before it is sent anyway (seconds)
+CLASSIFY_BATCH_SIZE = 10
+CLASSIFY_BATCH_LINGER = 0.5
+
+# Room types the classifier may answer with
+_ROOM_TYPES = (
+    "exterior",
+    "living",
+    "kitchen",
+    "dining",
+    "bedroom",
+    "master",
+    "bathroom",
+    "garage",
+    "closet",
+    "laundry",
+    "utility",
+    "storage",
+    "office",
+    "family",
+    "den",
+    "guest",
+    "basement",
+    "attic",
+)
+
+# Maps filename separators to spaces when building captions
+_CAPTION_TRANSLATE = str.maketrans("-_", "  ")
+
 
 def generate_unique_prefix(shoot_name, method="hash"):
     """Generate a unique prefix for photos based on shoot name"""
@@ -92,17 +160,24 @@ def generate_prefixed_filename(original_filename, prefix, counter=None, room_typ
     return f"{'-'.join(parts)}{ext}"
 
 
-def downsample_image(
-    input_path, output_path, max_width=1920, max_height=1080, quality=85
-):
-    """Downsample image for web optimization"""
+def downsample_image(input_path, max_width=1920, max_height=1080, quality=85):
+    """Downsample image for web optimization.
+
+    input_path may also be a binary file object. Returns the JPEG bytes, or None
+    if Pillow is unavailable or the image could not be processed (callers then
+    use the original file).
+    """
     if not PIL_AVAILABLE:
-        # If PIL not available, just copy the original
-        shutil.copy2(input_path, output_path)
-        return False
+        return None
 
+    buffer = io.BytesIO()
     try:
         with Image.open(input_path) as img:
+            # Let libjpeg decode at 1/2, 1/4 or 1/8 scale while keeping at least
+            # twice the target size for LANCZOS to finish from (the same
+            # headroom Image.thumbnail uses); a no-op for other formats
+            img.draft("RGB", (max_width * 2, max_height * 2))
+
             # Convert to RGB if necessary (handles RGBA, etc.)
             if img.mode in ("RGBA", "LA", "P"):
                 img = img.convert("RGB")
@@ -111,8 +186,8 @@ def downsample_image(
             width, height = img.size
             if width <= max_width and height <= max_height:
                 # Image is already small enough, but still optimize quality
-                img.save(output_path, "JPEG", quality=quality, optimize=True)
-                return True
+                img.save(buffer, "JPEG", quality=quality, optimize=True)
+                return buffer.getvalue()
 
             # Calculate resize ratio
             width_ratio = max_width / width
@@ -122,116 +197,259 @@ def downsample_image(
             new_width = int(width * ratio)
             new_height = int(height * ratio)
 
-            # Resize and save
-            resized_img = img.resize((new_width, new_height), Image.LANCZOS)
-            resized_img.save(output_path, "JPEG", quality=quality, optimize=True)
+            # Resize and save; reducing_gap first shrinks by an integer factor
+            # with a cheap box filter (SIMD-accelerated on Pillow-SIMD), leaving
+            # LANCZOS at most 2x the target to finish from
+            resized_img = img.resize(
+                (new_width, new_height), Image.LANCZOS, reducing_gap=2.0
+            )
+            resized_img.save(buffer, "JPEG", quality=quality, optimize=True)
 
-            return True
+            return buffer.getvalue()
     except Exception as e:
         print(f"   ⚠️  Error downsampling {input_path}: {e}")
-        # Fallback to copying original
-        shutil.copy2(input_path, output_path)
-        return False
+        return None
 
 
-def classify_image_with_ai(image_path, max_retries=3):
-    """Classify a real estate photo using OpenAI Vision API"""
-    if not OPENAI_AVAILABLE:
-        return None
+class RateLimiter:
+    """Token bucket that paces API calls under per-minute request/token limits.
+
+    Waiting before a call keeps a burst of concurrent requests from running
+    into 429 errors and the retry backoff that follows.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.max_requests = requests_per_minute
+        self.max_tokens = tokens_per_minute
+        self.available_requests = requests_per_minute
+        self.available_tokens = tokens_per_minute
+        self.updated = time.monotonic()
+
+    async def acquire(self, tokens):
+        """Wait until a request costing the given tokens fits both limits"""
+        # A request larger than the whole budget waits for a full bucket
+        tokens = min(tokens, self.max_tokens)
+        while True:
+            # Refill both buckets for the time since the last check
+            now = time.monotonic()
+            minutes = (now - self.updated) / 60
+            self.updated = now
+            self.available_requests = min(
+                self.max_requests,
+                self.available_requests + minutes * self.max_requests,
+            )
+            self.available_tokens = min(
+                self.max_tokens, self.available_tokens + minutes * self.max_tokens
+            )
 
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        print("⚠️  OPENAI_API_KEY not found in environment variables")
-        return None
+            if self.available_requests >= 1 and self.available_tokens >= tokens:
+                self.available_requests -= 1
+                self.available_tokens -= tokens
+                return
+
+            # Sleep until whichever bucket is short has refilled enough
+            await asyncio.sleep(
+                60
+                * max(
+                    (1 - self.available_requests) / self.max_requests,
+                    (tokens - self.available_tokens) / self.max_tokens,
+                )
+            )
 
-    client = openai.OpenAI(api_key=api_key)
 
+def shrink_for_vision(image_bytes):
+    """Return JPEG bytes of the image reduced to the Vision API payload budget"""
+    return downsample_image(io.BytesIO(image_bytes), 1024, 1024, 70) or image_bytes
+
+
+def write_file_atomic(path, data):
+    """Write bytes to path via a temp file so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp creates 0600 files; keep the existing mode or the umask default
+        if os.path.exists(path):
+            mode = os.stat(path).st_mode & 0o777
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_classify_cache():
+    """Load the content-hash → room type cache from previous runs"""
     try:
-        # Convert image to base64
-        with open(image_path, "rb") as image_file:
-            base64_image = base64.b64encode(image_file.read()).decode("utf-8")
+        with open(CLASSIFY_CACHE, "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
 
-        # Retry logic for API calls
-        for attempt in range(max_retries):
-            try:
-                response = client.chat.completions.create(
+
+def save_classify_cache(cache):
+    """Persist the content-hash → room type cache"""
+    write_file_atomic(
+        CLASSIFY_CACHE, json.dumps(cache, indent=2, sort_keys=True).encode()
+    )
+
+
+def _classify_prompt(count):
+    """Vision API instructions for a batch of count photos"""
+    return f"""Classify each of these {count} real estate photos by room type. For each photo, in the order given, choose exactly ONE word from this list:
+{", ".join(_ROOM_TYPES)}
+
+Choose the most specific and accurate room type. For outdoor/exterior shots, use 'exterior'. For bedrooms that appear to be master/primary bedrooms, use 'master'. For general living areas, use 'living'.
+Respond with JSON of the form {{"rooms": ["exterior", "kitchen", ...]}} holding exactly {count} words, one per photo."""
+
+
+async def classify_batch_with_ai_async(
+    client, images, semaphore, rate_limiter, max_retries=3
+):
+    """Classify several real estate photos with one OpenAI Vision API request.
+
+    images is a list of (base64_jpeg, name) pairs. Returns a room type, or None
+    if it could not be determined, for each image in order.
+    """
+    content = [{"type": "text", "text": _classify_prompt(len(images))}]
+    for base64_image, _ in images:
+        content.append(
+            {
+                "type": "image_url",
+                "image_url": {
+                    "url": f"data:image/jpeg;base64,{base64_image}",
+                    "detail": "low",  # Use low detail to reduce costs
+                },
+            }
+        )
+
+    max_tokens = 20 + 10 * len(images)
+
+    # Retry logic for API calls, backing off exponentially between attempts
+    for attempt in range(max_retries):
+        if attempt:
+            await asyncio.sleep(2**attempt)
+        try:
+            await rate_limiter.acquire(
+                CLASSIFY_PROMPT_TOKENS
+                + CLASSIFY_IMAGE_TOKENS * len(images)
+                + max_tokens
+            )
+            async with semaphore:
+                response = await client.chat.completions.create(
                     model="gpt-4o-mini",  # Using the more cost-effective model
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": """Classify this real estate photo. Look at the room type and respond with exactly ONE word from this list:
-exterior, living, kitchen, dining, bedroom, master, bathroom, garage, closet, laundry, utility, storage, office, family, den, guest, basement, attic
-
-Choose the most specific and accurate room type. For outdoor/exterior shots, use 'exterior'. For bedrooms that appear to be master/primary bedrooms, use 'master'. For general living areas, use 'living'. Respond with only the single word.""",
-                                },
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/jpeg;base64,{base64_image}",
-                                        "detail": "low",  # Use low detail to reduce costs
-                                    },
-                                },
-                            ],
-                        }
-                    ],
-                    max_tokens=10,
+                    messages=[{"role": "user", "content": content}],
+                    response_format={"type": "json_object"},
+                    max_tokens=max_tokens,
                     temperature=0,  # Make it deterministic
                 )
 
-                classification = response.choices[0].message.content.strip().lower()
-
-                # Validate the response is one of our expected room types
-                valid_types = {
-                    "exterior",
-                    "living",
-                    "kitchen",
-                    "dining",
-                    "bedroom",
-                    "master",
-                    "bathroom",
-                    "garage",
-                    "closet",
-                    "laundry",
-                    "utility",
-                    "storage",
-                    "office",
-                    "family",
-                    "den",
-                    "guest",
-                    "basement",
-                    "attic",
-                }
-
-                if classification in valid_types:
-                    return classification
-                else:
-                    print(
-                        "   ⚠️  Unexpected classification '{}', retrying...".format(
-                            classification
-                        )
-                    )
-                    continue
-
-            except Exception as api_error:
-                if attempt < max_retries - 1:
-                    print(f"   ⚠️  API call failed (attempt {attempt + 1}), retrying...")
-                    continue
-                else:
-                    print(
-                        f"   ❌ Failed to classify {image_path} after {max_retries} attempts: {api_error}"
-                    )
-                    return None
-
-        return None  # All retries failed
+            rooms = json.loads(response.choices[0].message.content)["rooms"]
+            if len(rooms) != len(images):
+                print(
+                    f"   ⚠️  Got {len(rooms)} classifications for {len(images)} "
+                    "photos, retrying..."
+                )
+                continue
+
+            # Validate each response is one of our expected room types
+            rooms = [str(room).strip().lower() for room in rooms]
+            return [room if room in _ROOM_TYPES else None for room in rooms]
+
+        except Exception as api_error:
+            if attempt < max_retries - 1:
+                print(f"   ⚠️  API call failed (attempt {attempt + 1}), retrying...")
+                continue
+            names = ", ".join(name for _, name in images)
+            print(
+                f"   ❌ Failed to classify {names} after {max_retries} attempts: {api_error}"
+            )
+
+    return [None] * len(images)  # All retries failed
+
+
+async def dispatch_classify_batches(client, batch_queue, semaphore, rate_limiter):
+    """Send queued images to the Vision API in batches; runs until cancelled.
+
+    batch_queue holds (base64_jpeg, name, future) items. A batch is sent once it
+    has CLASSIFY_BATCH_SIZE images, or CLASSIFY_BATCH_LINGER seconds after its
+    first image arrived, and each future receives that image's room type.
+    """
+    loop = asyncio.get_running_loop()
+    in_flight = set()
+
+    async def send(batch):
+        rooms = await classify_batch_with_ai_async(
+            client, [(image, name) for image, name, _ in batch], semaphore, rate_limiter
+        )
+        for (_, _, future), room_type in zip(batch, rooms):
+            if not future.done():
+                future.set_result(room_type)
+
+    while True:
+        batch = [await batch_queue.get()]
+        deadline = loop.time() + CLASSIFY_BATCH_LINGER
+        while len(batch) < CLASSIFY_BATCH_SIZE:
+            try:
+                batch.append(
+                    await asyncio.wait_for(batch_queue.get(), deadline - loop.time())
+                )
+            except asyncio.TimeoutError:
+                break
+
+        task = asyncio.create_task(send(batch))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+
+async def classify_image_with_ai_async(image_bytes, image_name, batch_queue, cache):
+    """Classify a real estate photo using OpenAI Vision API.
+
+    image_bytes is the encoded image and image_name is used in messages. The
+    image joins the next batch sent by dispatch_classify_batches from
+    batch_queue. cache maps image content hashes to room types; hits skip the
+    API call and new classifications are added to it.
+    """
+    try:
+        # Identical bytes were classified on an earlier run
+        cache_key = hashlib.sha256(image_bytes).hexdigest()
+        if cache_key in cache:
+            return cache[cache_key]
+
+        if len(image_bytes) > MAX_VISION_PAYLOAD_BYTES:
+            image_bytes = await asyncio.to_thread(shrink_for_vision, image_bytes)
+
+        # Convert image to base64 (always ASCII, which decodes faster than UTF-8)
+        base64_image = base64.b64encode(image_bytes).decode("ascii")
+
+        future = asyncio.get_running_loop().create_future()
+        await batch_queue.put((base64_image, image_name, future))
+        room_type = await future
+        if room_type:
+            cache[cache_key] = room_type
+        return room_type
 
     except Exception as e:
-        print(f"   ❌ Error processing image {image_path}: {e}")
+        print(f"   ❌ Error processing image {image_name}: {e}")
         return None
 
 
+@functools.lru_cache(maxsize=None)
+def get_aws_client(service_name):
+    """Return the shared boto3 client for a service (clients are thread-safe)"""
+    # Enough pooled connections for every upload thread and its parts
+    return boto3.client(
+        service_name,
+        config=BotocoreConfig(
+            max_pool_connections=UPLOAD_WORKERS * MULTIPART_CONCURRENCY
+        ),
+    )
+
+
 def upload_photos_to_s3(
     shoot_name,
     photo_urls,
@@ -242,6 +460,7 @@ def upload_photos_to_s3(
     quality=85,
     no_downsample=False,
     use_ai_classification=False,
+    invalidate_cache=False,
 ):
     """Upload photos to S3 bucket"""
     if not BOTO3_AVAILABLE:
@@ -252,9 +471,9 @@ def upload_photos_to_s3(
 
     # Initialize S3 client
     try:
-        s3_client = boto3.client("s3")
-        # Test credentials by listing buckets
-        s3_client.list_buckets()
+        s3_client = get_aws_client("s3")
+        # Test credentials without needing s3:ListAllMyBuckets permission
+        get_aws_client("sts").get_caller_identity()
         print("   ✅ AWS credentials configured")
     except NoCredentialsError:
         print("❌ AWS credentials not found. Please configure with:")
@@ -281,12 +500,17 @@ def upload_photos_to_s3(
 
     # Get existing objects in the shoot folder
     try:
-        response = s3_client.list_objects_v2(Bucket=S3_BUCKET, Prefix=f"{shoot_name}/")
-        existing_objects = [obj["Key"] for obj in response.get("Contents", [])]
+        # Paginate: a single list_objects_v2 call stops at 1000 keys
+        paginator = s3_client.get_paginator("list_objects_v2")
+        existing_objects = {
+            obj["Key"]
+            for page in paginator.paginate(Bucket=S3_BUCKET, Prefix=f"{shoot_name}/")
+            for obj in page.get("Contents", [])
+        }
         print(f"   📋 Found {len(existing_objects)} existing objects in S3")
     except ClientError as e:
         print(f"   ⚠️  Error listing S3 objects: {e}")
-        existing_objects = []
+        existing_objects = set()
 
     # Filter out photos that already exist (unless force_reupload)
     photos_to_upload = []
@@ -318,135 +542,251 @@ def upload_photos_to_s3(
         f"   📸 Will upload {len(photos_to_upload)} {'new ' if not force_reupload else ''}photos"
     )
 
-    # Create temporary directory for renamed files
-    with tempfile.TemporaryDirectory() as temp_dir:
-        print(f"   📁 Creating temporary optimized files...")
-
-        # Copy and rename files to temp directory with downsampling
-        temp_files = []
-        downsampled_count = 0
-
-        for photo_data in photos_to_upload:
-            original_path = None
-
-            # Find the original file path
-            for photo_file in Path(base_photos_dir).glob("**/*"):
-                if (
-                    photo_file.is_file()
-                    and photo_file.name == photo_data["original_filename"]
-                ):
-                    original_path = photo_file
-                    break
+    transfer_config = TransferConfig(
+        multipart_threshold=MULTIPART_THRESHOLD,
+        multipart_chunksize=MULTIPART_THRESHOLD,
+        max_concurrency=MULTIPART_CONCURRENCY,
+    )
 
-            if not original_path:
-                print(
-                    f"   ⚠️  Warning: Could not find {photo_data['original_filename']}"
+    # Prefix for filenames that gain a room classification
+    classify_prefix = generate_unique_prefix(shoot_name, "hash")
+
+    # Index the photos directory once instead of walking it for every photo
+    # (the first file found wins, as the per-photo search did)
+    files_by_name = {}
+    for photo_file in Path(base_photos_dir).rglob("*"):
+        if photo_file.is_file():
+            files_by_name.setdefault(photo_file.name, photo_file)
+
+    async def process_one(photo_data, executor, batch_queue, cache):
+        """Find, downsample, classify and upload one photo.
+
+        Resizing runs on the enclosing process_pool, other blocking work on
+        executor, and images to classify go on batch_queue (None to skip
+        classification). Returns (status, downsampled, log) where
+        status is "uploaded", "missing" or "failed" and log holds the progress
+        lines to print for this photo.
+        """
+        loop = asyncio.get_running_loop()
+        log = []
+        original_path = files_by_name.get(photo_data["original_filename"])
+
+        if not original_path:
+            log.append(
+                f"   ⚠️  Warning: Could not find {photo_data['original_filename']}"
+            )
+            return "missing", False, log
+
+        # Downsampled images stay in memory; originals upload straight from disk
+        image_bytes = None
+
+        if not no_downsample:
+            # Convert to .jpg for consistency and smaller file size
+            photo_data["filename"] = Path(photo_data["filename"]).stem + ".jpg"
+
+            image_bytes = await loop.run_in_executor(
+                process_pool,
+                downsample_image,
+                original_path,
+                max_width,
+                max_height,
+                quality,
+            )
+        downsampled = image_bytes is not None
+
+        # AI Classification of the downsampled image if requested
+        if batch_queue is not None:
+            if image_bytes is None:
+                # Pass the original without keeping a reference here, so only
+                # its shrunk copy stays in memory while the batch is pending
+                room_type = await classify_image_with_ai_async(
+                    await loop.run_in_executor(executor, original_path.read_bytes),
+                    photo_data["filename"],
+                    batch_queue,
+                    cache,
+                )
+            else:
+                room_type = await classify_image_with_ai_async(
+                    image_bytes, photo_data["filename"], batch_queue, cache
                 )
-                continue
 
-            # Process and save file with new name to temp directory
-            temp_file_path = Path(temp_dir) / photo_data["filename"]
+            if room_type:
+                log.append(f"   🤖 {photo_data['filename']} classified as: {room_type}")
 
-            if no_downsample:
-                # Just copy without downsampling
-                shutil.copy2(original_path, temp_file_path)
+                # Update the photo_data with the new name, keeping the .jpg
+                # extension of the in-memory downsampled image
+                new_filename = generate_prefixed_filename(
+                    photo_data["original_filename"],
+                    classify_prefix,
+                    room_type=room_type,
+                )
+                if downsampled:
+                    new_filename = Path(new_filename).stem + ".jpg"
+                photo_data["filename"] = new_filename
             else:
-                # Convert to .jpg for consistency and smaller file size
-                temp_file_path = temp_file_path.with_suffix(".jpg")
-                photo_data["filename"] = temp_file_path.name  # Update filename in data
-
-                if downsample_image(
-                    original_path, temp_file_path, max_width, max_height, quality
-                ):
-                    downsampled_count += 1
+                log.append(
+                    f"   ⚠️  Could not classify {photo_data['filename']}, keeping name"
+                )
 
-            temp_files.append((str(temp_file_path), photo_data))
+        s3_key = f"{shoot_name}/{photo_data['filename']}"
+
+        # Upload file with proper content type
+        content_type = "image/jpeg"
+        if photo_data["filename"].lower().endswith(".png"):
+            content_type = "image/png"
+        elif photo_data["filename"].lower().endswith(".webp"):
+            content_type = "image/webp"
+        extra_args = {
+            "ContentType": content_type,
+            "CacheControl": "max-age=31536000",  # 1 year cache
+        }
+
+        if image_bytes is not None:
+            # Downsampled JPEGs are a few hundred KB, so a single PUT beats
+            # the transfer manager's multipart machinery
+            upload = functools.partial(
+                s3_client.put_object,
+                Bucket=S3_BUCKET,
+                Key=s3_key,
+                Body=image_bytes,
+                **extra_args,
+            )
+        else:
+            upload = functools.partial(
+                s3_client.upload_file,
+                str(original_path),
+                S3_BUCKET,
+                s3_key,
+                ExtraArgs=extra_args,
+                Config=transfer_config,
+            )
 
-        if not temp_files:
-            print("❌ No new files to upload")
-            return len(skipped_photos) > 0
+        try:
+            await loop.run_in_executor(executor, upload)
+        except ClientError as e:
+            log.append(f"   ❌ Failed to upload {photo_data['filename']} to S3: {e}")
+            return "failed", downsampled, log
 
-        if downsampled_count > 0:
-            print(f"   🔧 Downsampled {downsampled_count} images for web optimization")
+        log.append(f"   📤 Uploaded {photo_data['filename']}")
+        return "uploaded", downsampled, log
 
-        # AI Classification of downsampled images if requested
+    async def process_all():
+        """Run every photo's pipeline; returns (status, downsampled) per photo"""
+        client = None
         if use_ai_classification and OPENAI_AVAILABLE:
-            print(f"   🤖 Classifying {len(temp_files)} images...")
-            classified_files = []
-
-            for i, (temp_file_path, photo_data) in enumerate(temp_files):
-                temp_path = Path(temp_file_path)
-
-                print(f"   🤖 Classifying {temp_path.name}...")
-                room_type = classify_image_with_ai(str(temp_path))
-
-                if room_type:
-                    print(f"   ✅ Classified as: {room_type}")
-
-                    # Generate new filename with room classification
-                    prefix = generate_unique_prefix(shoot_name, "hash")
+            api_key = os.getenv("OPENAI_API_KEY")
+            if api_key:
+                client = openai.AsyncOpenAI(api_key=api_key)
+            else:
+                print("⚠️  OPENAI_API_KEY not found in environment variables")
+        cache = {}
+        batch_queue = None
+        dispatcher = None
+        if client is not None:
+            cache = load_classify_cache()
+            batch_queue = asyncio.Queue()
+            dispatcher = asyncio.create_task(
+                dispatch_classify_batches(
+                    client,
+                    batch_queue,
+                    asyncio.Semaphore(CLASSIFY_CONCURRENCY),
+                    RateLimiter(OPENAI_REQUESTS_PER_MINUTE, OPENAI_TOKENS_PER_MINUTE),
+                )
+            )
+        cached_count = len(cache)
 
-                    new_filename = generate_prefixed_filename(
-                        photo_data["original_filename"],
-                        prefix,
-                        room_type=room_type,
-                    )
+        # Cap the photos in flight so a throttled classifier can't leave a
+        # whole shoot's images waiting in memory
+        in_flight = asyncio.Semaphore(UPLOAD_WORKERS)
 
-                    # Rename the temp file
-                    new_temp_path = temp_path.parent / new_filename
-                    temp_path.rename(new_temp_path)
-                    classified_files.append((str(new_temp_path), photo_data))
+        async def process_bounded(photo_data, executor):
+            async with in_flight:
+                return await process_one(photo_data, executor, batch_queue, cache)
 
-                    # Update the photo_data for consistency
-                    photo_data["filename"] = new_filename
-                else:
-                    print(f"   ⚠️  Could not classify, keeping original name")
-                    classified_files.append((temp_file_path, photo_data))
+        results = []
+        try:
+            with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+                tasks = [
+                    process_bounded(photo_data, executor)
+                    for photo_data in photos_to_upload
+                ]
+                for task in asyncio.as_completed(tasks):
+                    status, downsampled, log = await task
+                    print("\n".join(log))
+                    results.append((status, downsampled))
+        finally:
+            if client is not None:
+                dispatcher.cancel()
+                await client.close()
+            # Save even after an interruption so a rerun resumes where this stopped
+            if len(cache) > cached_count:
+                save_classify_cache(cache)
+        return results
+
+    # Resizing is CPU-bound, so spread it across one process per core
+    # (processes start on first use, so --no-downsample never pays for them)
+    with ProcessPoolExecutor() as process_pool:
+        print(f"   🔧 Optimizing and uploading photos...")
+
+        # Each photo runs through its own find → downsample → classify → upload
+        # pipeline, so one photo's network waits overlap with another's work
+        results = asyncio.run(process_all())
+
+    uploaded_count = sum(status == "uploaded" for status, _ in results)
+    failed_count = sum(status == "failed" for status, _ in results)
+    downsampled_count = sum(downsampled for _, downsampled in results)
+
+    if not uploaded_count and not failed_count:
+        print("❌ No new files to upload")
+        return len(skipped_photos) > 0
+
+    if downsampled_count > 0:
+        print(f"   🔧 Downsampled {downsampled_count} images for web optimization")
+
+    if failed_count:
+        print(f"❌ Failed to upload {failed_count} photos to S3")
+        return False
 
-            temp_files = classified_files
+    print(f"✅ Successfully uploaded {uploaded_count} photos to S3!")
 
-        print(f"   📸 Prepared {len(temp_files)} files for S3 upload")
+    # Invalidate CloudFront cache if needed
+    if invalidate_cache:
+        invalidate_cloudfront_cache(shoot_name)
+    else:
+        print(f"   🔄 Consider invalidating CloudFront cache for /{shoot_name}/*")
 
-        # Upload files to S3
-        try:
-            uploaded_count = 0
-            for temp_file_path, photo_data in temp_files:
-                s3_key = f"{shoot_name}/{photo_data['filename']}"
-
-                print(f"   📤 Uploading {photo_data['filename']}...")
-
-                # Upload file with proper content type
-                content_type = "image/jpeg"
-                if photo_data["filename"].lower().endswith(".png"):
-                    content_type = "image/png"
-                elif photo_data["filename"].lower().endswith(".webp"):
-                    content_type = "image/webp"
-
-                s3_client.upload_file(
-                    temp_file_path,
-                    S3_BUCKET,
-                    s3_key,
-                    ExtraArgs={
-                        "ContentType": content_type,
-                        "CacheControl": "max-age=31536000",  # 1 year cache
-                    },
-                )
-                uploaded_count += 1
+    if skipped_photos:
+        print(
+            f"   📊 Total: {uploaded_count} uploaded + {len(skipped_photos)} existing = {len(photo_urls)} total photos"
+        )
+    return True
 
-            print(f"✅ Successfully uploaded {uploaded_count} photos to S3!")
 
-            # Invalidate CloudFront cache if needed
-            print(f"   🔄 Consider invalidating CloudFront cache for /{shoot_name}/*")
+def invalidate_cloudfront_cache(shoot_name):
+    """Invalidate every cached object of a shoot with one wildcard path"""
+    if not CLOUDFRONT_DISTRIBUTION_ID:
+        print("   ⚠️  CLOUDFRONT_DISTRIBUTION_ID not set, skipping cache invalidation")
+        return False
 
-            if skipped_photos:
-                print(
-                    f"   📊 Total: {uploaded_count} uploaded + {len(skipped_photos)} existing = {len(photo_urls)} total photos"
-                )
-            return True
+    # One wildcard path counts as a single path for CloudFront billing, however
+    # many files it covers
+    try:
+        response = get_aws_client("cloudfront").create_invalidation(
+            DistributionId=CLOUDFRONT_DISTRIBUTION_ID,
+            InvalidationBatch={
+                "Paths": {"Quantity": 1, "Items": [f"/{shoot_name}/*"]},
+                "CallerReference": str(time.time()),
+            },
+        )
+    except ClientError as e:
+        print(f"   ⚠️  CloudFront invalidation failed: {e}")
+        return False
 
-        except ClientError as e:
-            print(f"❌ Failed to upload files to S3: {e}")
-            return False
+    invalidation_id = response["Invalidation"]["Id"]
+    print(
+        f"   🔄 Invalidating CloudFront cache for /{shoot_name}/* ({invalidation_id})"
+    )
+    return True
 
 
 def update_photos_json(shoot_id, shoot_data):
@@ -460,12 +800,15 @@ def update_photos_json(shoot_id, shoot_data):
     else:
         data = {}
 
+    if data.get(shoot_id) == shoot_data:
+        print(f"✅ {photos_file} already has this {shoot_id} data, not rewriting")
+        return
+
     # Add/update shoot
     data[shoot_id] = shoot_data
 
     # Save updated data
-    with open(photos_file, "w") as f:
-        json.dump(data, f, indent=2)
+    write_file_atomic(photos_file, json.dumps(data, indent=2).encode())
 
     print(f"✅ Updated {photos_file} with {shoot_id} data")
 
@@ -486,6 +829,7 @@ def generate_photo_urls(
     if use_prefix:
         prefix = generate_unique_prefix(shoot_name, prefix_method)
 
+    base_path = Path(base_photos_dir)
     for counter, photo_file in enumerate(photo_files, 1):
         original_filename = os.path.basename(photo_file)
 
@@ -502,51 +846,27 @@ def generate_photo_urls(
 
         # Generate caption with subdirectory context
         photo_path = Path(photo_file)
-        base_path = Path(base_photos_dir)
 
-        # Get relative path from base directory
+        # Get parent directory name relative to the base directory, if any
         try:
             relative_path = photo_path.relative_to(base_path)
-            # Get parent directory name if it exists
-            if len(relative_path.parts) > 1:
-                subdir = relative_path.parent.name
-                # Clean up filename for caption (use original name, not prefixed)
-                file_caption = (
-                    original_filename.replace(".jpg", "")
-                    .replace(".jpeg", "")
-                    .replace(".png", "")
-                    .replace(".webp", "")
-                )
-                file_caption = file_caption.replace("-", " ").replace("_", " ").title()
-                # Combine subdirectory and filename
-                caption = f"{subdir.replace('-', ' ').replace('_', ' ').title()} - {file_caption}"
-            else:
-                # No subdirectory, just use filename
-                caption = (
-                    original_filename.replace(".jpg", "")
-                    .replace(".jpeg", "")
-                    .replace(".png", "")
-                    .replace(".webp", "")
-                )
-                caption = caption.replace("-", " ").replace("_", " ").title()
+            subdir = relative_path.parent.name if len(relative_path.parts) > 1 else None
         except ValueError:
             # Fallback if relative path calculation fails
-            caption = (
-                original_filename.replace(".jpg", "")
-                .replace(".jpeg", "")
-                .replace(".png", "")
-                .replace(".webp", "")
-            )
-            caption = caption.replace("-", " ").replace("_", " ").title()
+            subdir = None
+
+        # Clean up filename for caption (use original name, not prefixed)
+        caption = photo_path.stem.translate(_CAPTION_TRANSLATE).title()
+        if subdir:
+            # Combine subdirectory and filename
+            caption = f"{subdir.translate(_CAPTION_TRANSLATE).title()} - {caption}"
 
         urls.append(
             {
                 "filename": new_filename,
                 "original_filename": original_filename,
                 "caption": caption,
-                "subdirectory": (
-                    relative_path.parent.name if len(relative_path.parts) > 1 else None
-                ),
+                "subdirectory": subdir,
                 "counter": counter if sequential_numbering else None,
             }
         )
@@ -645,6 +965,12 @@ def main():
         action="store_true",
         help="Use OpenAI Vision API to automatically classify room types and include in filenames",
     )
+    parser.add_argument(
+        "--invalidate-cloudfront",
+        action="store_true",
+        help="Invalidate the shoot's CloudFront cache after upload "
+        "(needs CLOUDFRONT_DISTRIBUTION_ID)",
+    )
 
     args = parser.parse_args()
 
@@ -653,13 +979,12 @@ def main():
         print(f"❌ Photos directory not found: {args.photos}")
         return
 
-    # Find photo files (recursive search)
-    photo_extensions = [".jpg", ".jpeg", ".png", ".webp"]
-    photo_files = []
-
-    for ext in photo_extensions:
-        photo_files.extend(Path(args.photos).glob(f"**/*{ext}"))
-        photo_files.extend(Path(args.photos).glob(f"**/*{ext.upper()}"))
+    # Find photo files (recursive search, one walk, any extension case)
+    photo_files = [
+        photo_file
+        for photo_file in Path(args.photos).rglob("*")
+        if photo_file.suffix.lower() in PHOTO_EXTENSIONS and photo_file.is_file()
+    ]
 
     if not photo_files:
         print(f"❌ No photo files found in {args.photos}")
@@ -670,9 +995,9 @@ def main():
 
     # Group photos by subdirectory for better display
     photos_by_dir = {}
+    base_path = Path(args.photos)
     for photo in photo_files:
         photo_path = Path(photo)
-        base_path = Path(args.photos)
         try:
             relative_path = photo_path.relative_to(base_path)
             if len(relative_path.parts) > 1:
@@ -766,6 +1091,7 @@ def main():
             args.quality,
             args.no_downsample,
             args.ai_classify,
+            args.invalidate_cloudfront,
         )
         if upload_success:
             print(f"\n🎉 Complete! Photos uploaded to S3 and website updated.")
@@ -3,76 +3,426 @@
 Simple HTTP server with CORS headers enabled for local development
 Includes clean URL support (no .html extensions needed)
 """
-import http.server
+import collections
+import datetime
+import email.utils
 import os
-import socketserver
-from urllib.parse import urlparse
+import queue
+import signal
+import socket
+import sys
+import threading
+import time
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 
+# Clean-URL paths are never looked up under these folders
+_NO_CLEAN_URL_PREFIXES = ("/pages/", "/src/", "/config/", "/assets/")
+
+# Content types of the site's own assets, looked up directly instead of going
+# through mimetypes on every request (other extensions still fall back to it)
+_MIME_TYPES = {
+    "html": "text/html; charset=utf-8",
+    "css": "text/css; charset=utf-8",
+    "js": "text/javascript; charset=utf-8",
+    "json": "application/json",
+    "webmanifest": "application/manifest+json",
+    "svg": "image/svg+xml",
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "ico": "image/vnd.microsoft.icon",
+    "mp4": "video/mp4",
+    "m4v": "video/mp4",
+    "mov": "video/quicktime",
+    "webm": "video/webm",
+    "pdf": "application/pdf",
+    "woff2": "font/woff2",
+}
+
+# Missing files are remembered briefly so repeated probes (favicons, bots)
+# skip the filesystem, while files created during a session still show up
+MISS_CACHE_SECONDS = 5
+MISS_CACHE_SIZE = 2048
+_misses = {}
+_misses_lock = threading.Lock()
+
+# Small files (HTML, CSS, JS) stay in memory with their encoded headers,
+# checked against the file's mtime and size on every request so edits show up
+FILE_CACHE_MAX_SIZE = 256 * 1024
+FILE_CACHE_ENTRIES = 256
+_file_cache = collections.OrderedDict()
+_file_cache_lock = threading.Lock()
+
+# Request log lines are queued and written to stderr in batches by a background
+# thread, so handler threads never wait on the terminal.
+# CORS_SERVER_QUIET=1 drops the per-request lines (errors are still logged)
+LOG_FLUSH_SECONDS = 0.05
+QUIET = os.getenv("CORS_SERVER_QUIET") == "1"
+_log_queue = queue.SimpleQueue()
+# Control characters (C0, DEL and C1) are logged as \xNN, so request lines
+# can't inject terminal escape sequences; backslashes are doubled so the
+# escapes stay unambiguous
+_LOG_ESCAPES = {c: f"\\x{c:02x}" for c in [*range(0x20), *range(0x7F, 0xA0)]}
+_LOG_ESCAPES[ord("\\")] = "\\\\"
+_log_lock = threading.Lock()
+
+# Clean URL → page file to serve, built at startup (send SIGHUP to rescan)
+ROUTES = {}
+
+
+def build_route_table():
+    """Map every clean URL of the pages/ HTML files to the file to serve"""
+    routes = {}
+    # os.walk lists each directory once with scandir and tells files from
+    # subdirectories from the directory entries, without a stat per page
+    for dirpath, dirnames, filenames in os.walk("pages"):
+        subdir = os.path.relpath(dirpath, "pages").replace(os.sep, "/")
+        prefix = "" if subdir == "." else subdir + "/"
+        for name in filenames:
+            if not name.endswith(".html"):
+                continue
+            stem = prefix + name[: -len(".html")]
+            target = f"/pages/{stem}.html"
+            # /real-estate serves pages/real-estate.html...
+            for url in (f"/{stem}", f"/{stem}/"):
+                if not url.startswith(_NO_CLEAN_URL_PREFIXES):
+                    routes[url] = target
+            # ...and so does /pages/real-estate
+            for url in (f"/pages/{stem}", f"/pages/{stem}/"):
+                routes[url] = target
+
+    # Root and the pages/ directory serve pages/index.html directly
+    routes["/"] = routes["/pages/"] = "/pages/index.html"
+
+    # Files that exist as-is are served normally
+    return {
+        url: target for url, target in routes.items() if not os.path.isfile("." + url)
+    }
+
+
+def remember_miss(path):
+    """Record that path did not exist, evicting the oldest miss when full"""
+    with _misses_lock:
+        _misses.pop(path, None)
+        if len(_misses) >= MISS_CACHE_SIZE:
+            del _misses[next(iter(_misses))]
+        _misses[path] = time.monotonic() + MISS_CACHE_SECONDS
+
+
+def recently_missed(path):
+    """True if path was found missing within the last MISS_CACHE_SECONDS"""
+    expires = _misses.get(path)
+    return expires is not None and expires > time.monotonic()
+
+
+def cache_file(path, entry):
+    """Store a (mtime_ns, head, body) entry, evicting the least recently used"""
+    with _file_cache_lock:
+        _file_cache[path] = entry
+        _file_cache.move_to_end(path)
+        if len(_file_cache) > FILE_CACHE_ENTRIES:
+            _file_cache.popitem(last=False)
+
+
+def make_etag(mtime_ns, size):
+    """Validator that changes whenever the file is modified or resized"""
+    return f'"{mtime_ns:x}-{size:x}"'
+
+
+def cached_file(path):
+    """Return path's cache entry if the file is unchanged, else None"""
+    entry = _file_cache.get(path)
+    if entry is None:
+        return None
+    mtime_ns, head, body = entry
+    try:
+        st = os.stat(path)
+        unchanged = st.st_mtime_ns == mtime_ns and st.st_size == len(body)
+    except OSError:
+        unchanged = False
+    with _file_cache_lock:
+        if not unchanged:
+            _file_cache.pop(path, None)
+            return None
+        if path in _file_cache:
+            _file_cache.move_to_end(path)
+    return entry
+
+
+def flush_log_queue():
+    """Write every queued log line to stderr"""
+    with _log_lock:
+        lines = []
+        while True:
+            try:
+                lines.append(_log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if lines:
+            sys.stderr.write("".join(lines))
+            sys.stderr.flush()
+
+
+def write_log_queue():
+    """Log writer thread: flush the queue every LOG_FLUSH_SECONDS"""
+    while True:
+        time.sleep(LOG_FLUSH_SECONDS)
+        flush_log_queue()
+
+
+def reload_routes(signum, frame):
+    """SIGHUP handler: pick up pages added or removed since startup"""
+    global ROUTES
+    ROUTES = build_route_table()
+    with _misses_lock:
+        _misses.clear()
+    print(f"🔄 Rescanned pages/ ({len(ROUTES)} clean URLs)")
+
+
+class CORSHTTPRequestHandler(SimpleHTTPRequestHandler):
+    # Keep connections open between requests (video clients issue many)
+    protocol_version = "HTTP/1.1"
+    # Send small responses (headers, 304s) without waiting on Nagle's algorithm
+    disable_nagle_algorithm = True
+
+    # Same on every response, so encoded once instead of via three send_header
+    CORS_HEADERS = (
+        b"Access-Control-Allow-Origin: *\r\n"
+        b"Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
+        b"Access-Control-Allow-Headers: *\r\n"
+    )
+    # Max-Age lets browsers reuse a preflight for a day instead of repeating it
+    PREFLIGHT_RESPONSE = (
+        b"HTTP/1.1 204 No Content\r\n"
+        + CORS_HEADERS
+        + b"Access-Control-Max-Age: 86400\r\n\r\n"
+    )
 
-class CORSHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     def end_headers(self):
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "*")
+        # HTTP/0.9 responses carry no headers (and have no header buffer)
+        if self.request_version != "HTTP/0.9":
+            self._headers_buffer.append(self.CORS_HEADERS)
         super().end_headers()
 
+    def guess_type(self, path):
+        content_type = _MIME_TYPES.get(path.rpartition(".")[2].lower())
+        if content_type is None:
+            content_type = super().guess_type(path)
+        return content_type
+
+    def log_message(self, format, *args):
+        message = (format % args).translate(_LOG_ESCAPES)
+        _log_queue.put(
+            "%s - - [%s] %s\n"
+            % (self.address_string(), self.log_date_time_string(), message)
+        )
+
+    def log_request(self, code="-", size="-"):
+        if not QUIET:
+            super().log_request(code, size)
+
     def do_OPTIONS(self):
-        self.send_response(200)
-        self.end_headers()
+        # Preflights need no routing or file access: one pre-encoded write
+        self.log_request(HTTPStatus.NO_CONTENT)
+        self.wfile.write(self.PREFLIGHT_RESPONSE)
 
-    def do_GET(self):
-        # Handle clean URLs by checking for .html files
-        parsed_path = urlparse(self.path)
-        path = parsed_path.path
-
-        # Root serves pages/index.html directly
-        if path == "/":
-            self.path = "/pages/index.html"
-            return super().do_GET()
-
-        # Check if path exists as-is first (normal file handling)
-        if os.path.exists("." + path) and not os.path.isdir("." + path):
-            return super().do_GET()
-
-        # Clean URL handling: serve /real-estate as pages/real-estate.html
-        if (
-            not path.startswith("/pages/")
-            and not path.startswith("/src/")
-            and not path.startswith("/config/")
-            and not path.startswith("/assets/")
-        ):
-            clean_path = path.strip("/")
-            if clean_path and os.path.exists(f"./pages/{clean_path}.html"):
-                # Serve the file directly without redirect
-                self.path = f"/pages/{clean_path}.html" + (
-                    parsed_path.query and "?" + parsed_path.query or ""
-                )
-                return super().do_GET()
+    def send_head(self):
+        # Open first and take one fstat for type, size and mtime instead of a
+        # separate isdir stat; directories keep the stock redirect, index.html
+        # and listing handling
+        path = self.translate_path(self.path)
+        self.file_size = None
+        if recently_missed(path):
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+        entry = cached_file(path)
+        if entry is not None:
+            self.send_cached(*entry)
+            return None
+        try:
+            f = open(path, "rb")
+        except IsADirectoryError:
+            return super().send_head()
+        except OSError as e:
+            if isinstance(e, FileNotFoundError):
+                remember_miss(path)
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
 
-        # For paths in pages/ directory, try adding .html
-        if path.startswith("/pages/") and not path.endswith(".html"):
-            clean_path = path.rstrip("/")
-            html_path = clean_path + ".html"
+        try:
+            st = os.fstat(f.fileno())
+            etag = make_etag(st.st_mtime_ns, st.st_size)
+            if self.not_modified(etag, st.st_mtime):
+                self.send_not_modified(etag)
+                f.close()
+                return None
 
-            if os.path.exists("." + html_path):
-                # Serve the .html file but keep clean URL in browser
-                self.path = html_path + (
-                    parsed_path.query and "?" + parsed_path.query or ""
+            if st.st_size <= FILE_CACHE_MAX_SIZE and self.request_version != "HTTP/0.9":
+                # Small file: read it once and keep the whole response
+                body = f.read()
+                f.close()
+                head = (
+                    (
+                        f"Content-type: {self.guess_type(path)}\r\n"
+                        f"Content-Length: {len(body)}\r\n"
+                        f"Last-Modified: {self.date_time_string(st.st_mtime)}\r\n"
+                        f"ETag: {etag}\r\n"
+                    ).encode("latin-1", "strict")
+                    + self.CORS_HEADERS
+                    + b"\r\n"
                 )
-                return super().do_GET()
+                entry = (st.st_mtime_ns, head, body)
+                cache_file(path, entry)
+                self.send_cached(*entry)
+                return None
+
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-type", self.guess_type(path))
+            self.send_header("Content-Length", str(st.st_size))
+            self.send_header("Last-Modified", self.date_time_string(st.st_mtime))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.file_size = st.st_size
+            return f
+        except BaseException:
+            f.close()
+            raise
+
+    def send_cached(self, mtime_ns, head, body):
+        """Answer from a small-file cache entry in a single write"""
+        etag = make_etag(mtime_ns, len(body))
+        if self.not_modified(etag, mtime_ns / 1e9):
+            self.send_not_modified(etag)
+            return
+        # send_response adds the status line, Server and Date; the cached
+        # head holds the rest, CORS headers and blank line included
+        self.send_response(HTTPStatus.OK)
+        self._headers_buffer.append(head)
+        if self.command != "HEAD":
+            self._headers_buffer.append(body)
+        self.flush_headers()
+
+    def send_not_modified(self, etag):
+        self.send_response(HTTPStatus.NOT_MODIFIED)
+        self.send_header("ETag", etag)
+        self.end_headers()
+
+    def not_modified(self, etag, mtime):
+        """True if the client's cached copy (If-None-Match, else
+        If-Modified-Since) is still current"""
+        if_none_match = self.headers["If-None-Match"]
+        if if_none_match is not None:
+            # Weak comparison, as for any GET/HEAD revalidation
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+        try:
+            since = email.utils.parsedate_to_datetime(self.headers["If-Modified-Since"])
+        except (TypeError, IndexError, OverflowError, ValueError):
+            # Missing or ill-formed header
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=datetime.timezone.utc)
+        # Last-Modified has whole seconds, so compare at that precision
+        return int(mtime) <= since.timestamp()
 
-        # Handle pages/ directory index
-        if path == "/pages/":
-            self.path = "/pages/index.html"
-            return super().do_GET()
+    def copyfile(self, source, outputfile):
+        # Let the kernel move file bytes straight to the socket (sendfile)
+        if self.file_size is None or not hasattr(os, "sendfile"):
+            # Directory index pages from the stock send_head, or no os.sendfile
+            try:
+                self.connection.sendfile(source)
+            except (AttributeError, OSError):
+                super().copyfile(source, outputfile)
+            return
 
-        # Default handling
+        # Send exactly the Content-Length from send_head's fstat, which also
+        # spares socket.sendfile's own fstat of the file
+        out_fd, in_fd = self.connection.fileno(), source.fileno()
+        offset = 0
+        try:
+            while offset < self.file_size:
+                sent = os.sendfile(out_fd, in_fd, offset, self.file_size - offset)
+                if not sent:
+                    # The file shrank since send_head; the body is short of
+                    # its Content-Length, so the connection can't be reused
+                    self.close_connection = True
+                    break
+                offset += sent
+        except OSError:
+            if offset:
+                raise
+            super().copyfile(source, outputfile)
+
+    def do_GET(self):
+        # Serve clean URLs (/real-estate) from their pages/*.html file
+        path, sep, query = self.path.partition("?")
+        target = ROUTES.get(path)
+        if target is not None:
+            # Serve the .html file but keep clean URL in browser
+            self.path = target + sep + query
         return super().do_GET()
 
 
+class ReusePortHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer that several processes can bind to the same port"""
+
+    def server_bind(self):
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+def fork_workers(count):
+    """Fork count - 1 more server processes.
+
+    Returns the worker pids in the parent and None in each worker.
+    """
+    workers = []
+    for _ in range(count - 1):
+        pid = os.fork()
+        if pid == 0:
+            return None
+        workers.append(pid)
+    return workers
+
+
 if __name__ == "__main__":
     PORT = 8080
-    with socketserver.TCPServer(("", PORT), CORSHTTPRequestHandler) as httpd:
-        print(f"🌐 CORS-enabled server running at http://localhost:{PORT}")
-        print("📹 This should resolve video preloading CORS issues")
-        httpd.serve_forever()
+    # CORS_SERVER_WORKERS=N serves from N processes sharing the port, so more
+    # than one core handles requests (the kernel spreads connections on Linux)
+    WORKERS = int(os.getenv("CORS_SERVER_WORKERS", "1"))
+
+    ROUTES = build_route_table()
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, reload_routes)
+
+    server_class = ThreadingHTTPServer
+    workers = []
+    if WORKERS > 1:
+        if not hasattr(socket, "SO_REUSEPORT") or not hasattr(os, "fork"):
+            print("⚠️  CORS_SERVER_WORKERS needs SO_REUSEPORT and fork, using 1")
+        else:
+            server_class = ReusePortHTTPServer
+            workers = fork_workers(WORKERS)
+
+    # Turn `kill` into a normal exit, so the parent stops its workers and every
+    # process writes out its queued log lines
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit())
+
+    threading.Thread(target=write_log_queue, daemon=True).start()
+
+    # One thread per connection so a long video transfer doesn't block the
+    # page's other requests (daemon threads, so Ctrl-C still exits promptly)
+    with server_class(("", PORT), CORSHTTPRequestHandler) as httpd:
+        if workers is not None:
+            print(f"🌐 CORS-enabled server running at http://localhost:{PORT}")
+            print("📹 This should resolve video preloading CORS issues")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for pid in workers or ():
+                os.kill(pid, signal.SIGTERM)
+            flush_log_queue()
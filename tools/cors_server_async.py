@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Event-loop variant of cors_server.py for local development
+
+Serves the same clean URLs and CORS headers from a single aiohttp event loop
+(on uvloop when installed), so idle keep-alive connections cost no threads.
+Files go out through aiohttp's FileResponse, which uses sendfile and answers
+conditional and range requests itself.
+
+Usage: python3 tools/cors_server_async.py  (needs: pip install aiohttp)
+"""
+import asyncio
+import signal
+from pathlib import Path
+
+import cors_server
+
+try:
+    from aiohttp import web
+
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+    print("⚠️  aiohttp not available. Install with: pip install aiohttp")
+
+try:
+    import uvloop
+
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+PORT = 8080
+
+# Served directory (run from the project root, like cors_server.py)
+SITE_ROOT = Path.cwd().resolve()
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+    "Access-Control-Allow-Headers": "*",
+}
+
+
+async def cors_middleware(request, handler):
+    """Add the CORS headers to every response, errors included"""
+    try:
+        response = await handler(request)
+    except web.HTTPException as e:
+        e.headers.update(CORS_HEADERS)
+        raise
+    response.headers.update(CORS_HEADERS)
+    return response
+
+
+async def handle(request):
+    """Serve a file, resolving clean URLs through cors_server's route table"""
+    if request.method == "OPTIONS":
+        # Let browsers reuse the preflight for a day
+        return web.Response(status=204, headers={"Access-Control-Max-Age": "86400"})
+    if request.method not in ("GET", "HEAD"):
+        raise web.HTTPNotImplemented()
+
+    path = cors_server.ROUTES.get(request.path, request.path)
+    # Never step outside the site directory; symlinks inside it (e.g. shoots
+    # linked in from elsewhere) are followed, as cors_server.py does
+    if ".." in path.split("/"):
+        raise web.HTTPNotFound()
+    fs_path = SITE_ROOT / path.lstrip("/")
+
+    if fs_path.is_dir():
+        if not path.endswith("/"):
+            location = request.path + "/"
+            if request.query_string:
+                location += "?" + request.query_string
+            raise web.HTTPMovedPermanently(location)
+        fs_path = fs_path / "index.html"
+    if not fs_path.is_file():
+        raise web.HTTPNotFound()
+    return web.FileResponse(fs_path)
+
+
+async def watch_sighup(app):
+    """Rescan pages/ on SIGHUP, like cors_server.py"""
+    asyncio.get_running_loop().add_signal_handler(
+        signal.SIGHUP, cors_server.reload_routes, signal.SIGHUP, None
+    )
+
+
+def create_app():
+    app = web.Application(middlewares=[web.middleware(cors_middleware)])
+    app.router.add_route("*", "/{tail:.*}", handle)
+    if hasattr(signal, "SIGHUP"):
+        app.on_startup.append(watch_sighup)
+    return app
+
+
+if __name__ == "__main__":
+    if AIOHTTP_AVAILABLE:
+        cors_server.ROUTES = cors_server.build_route_table()
+        if UVLOOP_AVAILABLE:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        print(f"🌐 CORS-enabled async server running at http://localhost:{PORT}")
+        print("📹 This should resolve video preloading CORS issues")
+        web.run_app(create_app(), port=PORT, print=None)